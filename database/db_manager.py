@@ -1,35 +1,161 @@
 # sms_management_system/database/db_manager.py
 
+import functools
+import logging
+import re
 import sqlite3
+import threading
+from contextlib import contextmanager
 from database.schema import DATABASE_NAME, create_schema
 
+# Matches the target table of INSERT/UPDATE/DELETE statements
+_WRITE_TARGET_RE = re.compile(
+    r'^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+(\w+)',
+    re.IGNORECASE)
+
+@functools.lru_cache(maxsize=256)
+def _write_target(query):
+    """
+    Returns the lower-cased table written by an INSERT/UPDATE/DELETE statement,
+    or None for any other statement. Cached per SQL text, like the connection's
+    compiled statements, so each fixed query is only classified once.
+    """
+    match = _WRITE_TARGET_RE.match(query)
+    return match.group(1).lower() if match else None
+
+logger = logging.getLogger(__name__)
+
 class DBManager:
     """
     Manages database connections and provides generic CRUD operations.
     """
+    # Per-table write counters, shared by every instance since they all use the same
+    # database file. Caches compare them to detect stale entries.
+    _table_versions = {}
+    _versions_lock = threading.Lock()
+
     def __init__(self):
         """
         Initializes the DBManager, ensuring the database schema exists.
+        Each thread using the DBManager gets its own connection and transaction
+        state, since sqlite3 connections can't be shared between threads.
         """
         create_schema() # Ensure schema is created when DBManager is instantiated
-        self.conn = None
+        self._local = threading.local()
+
+    @property
+    def conn(self):
+        """
+        The current thread's database connection, or None if it isn't open.
+        """
+        return getattr(self._local, 'conn', None)
+
+    @property
+    def _transaction_depth(self):
+        return getattr(self._local, 'transaction_depth', 0) # > 0 while inside transaction()
+
+    @_transaction_depth.setter
+    def _transaction_depth(self, depth):
+        self._local.transaction_depth = depth
+
+    @property
+    def _transaction_tables(self):
+        # Tables written in the current thread's transaction
+        if not hasattr(self._local, 'transaction_tables'):
+            self._local.transaction_tables = set()
+        return self._local.transaction_tables
+
+    def in_transaction(self):
+        """
+        Returns True while the current thread is inside a transaction() block.
+        """
+        return self._transaction_depth > 0
 
     def get_connection(self):
         """
-        Establishes and returns a database connection.
+        Establishes and returns the current thread's database connection.
         """
-        if self.conn is None:
-            self.conn = sqlite3.connect(DATABASE_NAME)
-            self.conn.row_factory = sqlite3.Row # Allows accessing columns by name
-        return self.conn
+        conn = self.conn
+        if conn is None:
+            # A larger statement cache keeps the compiled form of every fixed service query
+            conn = sqlite3.connect(DATABASE_NAME, cached_statements=256)
+            conn.row_factory = sqlite3.Row # Allows accessing columns by name
+            # WAL lets readers (listings, reports) proceed while a write is in progress
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL") # Safe with WAL; fsyncs only at checkpoints
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456") # 256 MiB
+            conn.execute("PRAGMA cache_size=-65536") # 64 MiB page cache
+            self._local.conn = conn
+        return conn
 
     def close_connection(self):
         """
-        Closes the database connection.
+        Closes the current thread's database connection.
         """
         if self.conn:
             self.conn.close()
-            self.conn = None
+            self._local.conn = None
+
+    def table_version(self, table_name):
+        """
+        Returns a counter that changes whenever the given table is written
+        through a DBManager. Caches compare it to detect stale entries.
+        """
+        return self._table_versions.get(table_name.lower(), 0)
+
+    def _mark_written(self, query):
+        """
+        Bumps the version of the table targeted by a write statement.
+        """
+        table = _write_target(query)
+        if table:
+            self._bump_version(table)
+            if self._transaction_depth:
+                self._transaction_tables.add(table)
+
+    def _bump_version(self, table):
+        """
+        Increments the shared version counter of a table.
+        """
+        with DBManager._versions_lock:
+            DBManager._table_versions[table] = DBManager._table_versions.get(table, 0) + 1
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups several writes into a single transaction, committed once at the end
+        of the block, or rolled back if an exception escapes it. Writes made through
+        execute_query/insert_one/insert_many inside the block are not committed
+        individually. Blocks can be nested; only the outermost one commits.
+        The outermost block takes the write lock up front (BEGIN IMMEDIATE), so a
+        block that reads before it writes can't fail with SQLITE_BUSY halfway through.
+        Yields:
+            sqlite3.Connection: The connection the transaction runs on.
+        """
+        conn = self.get_connection()
+        if not self._transaction_depth and not conn.in_transaction:
+            conn.execute('BEGIN IMMEDIATE')
+        self._transaction_depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
+                conn.rollback()
+                # Cached reads may have seen the rolled-back rows
+                for table in self._transaction_tables:
+                    self._bump_version(table)
+                self._transaction_tables.clear()
+            raise
+        self._transaction_depth -= 1
+        if not self._transaction_depth:
+            conn.commit()
+            # Other threads may have read (and cached under the version bumped by the
+            # write) the pre-commit rows in between; invalidate those entries too
+            for table in self._transaction_tables:
+                self._bump_version(table)
+            self._transaction_tables.clear()
 
     def execute_query(self, query, params=()):
         """
@@ -40,12 +166,15 @@ class DBManager:
         cursor = conn.cursor()
         try:
             cursor.execute(query, params)
-            if query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')):
-                conn.commit()
+            if _write_target(query):
+                if not self._transaction_depth: # transaction() commits at the end of its block
+                    conn.commit()
+                self._mark_written(query)
             return cursor
         except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            conn.rollback() # Rollback changes in case of error
+            logger.debug("Database error: %s", e) # The caller handles and reports it
+            if not self._transaction_depth: # Leave the decision to the enclosing transaction()
+                conn.rollback() # Rollback changes in case of error
             raise # Re-raise the exception to be handled by the caller
 
     def fetch_all(self, query, params=()):
@@ -65,20 +194,166 @@ class DBManager:
         row = cursor.fetchone()
         return dict(row) if row else None
 
-    def insert_one(self, table_name, data):
+    def iter_all(self, query, params=(), chunk_size=1000):
+        """
+        Streams the rows of a SELECT query, fetching chunk_size rows at a time
+        with fetchmany() so large reports don't hold every row in memory.
+        Yields dictionaries (or Row objects).
+        """
+        cursor = self.execute_query(query, params)
+        cursor.arraysize = chunk_size
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+
+    def fetch_columns(self, query, params=()):
+        """
+        Fetches all rows from a SELECT query in columnar form, one list per column,
+        which avoids building a dictionary for every row of a large report.
+        Returns a dictionary mapping each column name to the list of its values.
+        """
+        cursor = self.execute_query(query, params)
+        columns = [description[0] for description in cursor.description]
+        rows = cursor.fetchall()
+        if not rows:
+            return {column: [] for column in columns}
+        return {column: list(values) for column, values in zip(columns, zip(*rows))}
+
+    def insert_one(self, table_name, data, ignore_duplicates=False):
         """
         Inserts a single record into the specified table.
         Args:
             table_name (str): The name of the table.
             data (dict): A dictionary where keys are column names and values are data.
+            ignore_duplicates (bool, optional): Skip the record if it would violate a UNIQUE
+                                                constraint instead of failing. Defaults to False.
         Returns:
-            int: The ID of the newly inserted row.
+            int: The ID of the newly inserted row, or None if it was skipped.
         """
         columns = ', '.join(data.keys())
         placeholders = ', '.join(['?' for _ in data.values()])
         query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+        if ignore_duplicates:
+            query += " ON CONFLICT DO NOTHING"
         cursor = self.execute_query(query, tuple(data.values()))
-        return cursor.lastrowid
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def insert_returning(self, table_name, data, columns='*'):
+        """
+        Inserts a single record and returns the stored row, including its ID and
+        any column defaults, from the same statement.
+        Args:
+            table_name (str): The name of the table.
+            data (dict): A dictionary where keys are column names and values are data.
+            columns (str, optional): The columns to return. Defaults to all columns.
+        Returns:
+            dict: The inserted row.
+        """
+        column_names = ', '.join(data.keys())
+        placeholders = ', '.join(['?' for _ in data.values()])
+        query = f"INSERT INTO {table_name} ({column_names}) VALUES ({placeholders}) RETURNING {columns}"
+        return self._execute_returning(query, tuple(data.values()))
+
+    def insert_many(self, table_name, rows, ignore_duplicates=False):
+        """
+        Inserts several records into the specified table with a single
+        executemany() call inside one transaction (or the enclosing transaction()).
+        Args:
+            table_name (str): The name of the table.
+            rows (list[dict]): The records to insert; all must have the same keys.
+            ignore_duplicates (bool, optional): Skip rows that would violate a UNIQUE
+                                                constraint instead of failing the batch.
+                                                Defaults to False.
+        Returns:
+            int: Number of rows inserted.
+        """
+        if not rows:
+            return 0
+        columns = list(rows[0].keys())
+        placeholders = ', '.join(['?' for _ in columns])
+        query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        if ignore_duplicates:
+            query += " ON CONFLICT DO NOTHING"
+        return self._execute_many(query, columns, rows)
+
+    def upsert_one(self, table_name, data, conflict_columns):
+        """
+        Inserts a single record, or updates the existing record that has the same
+        values in conflict_columns, in one statement.
+        Args:
+            table_name (str): The name of the table.
+            data (dict): A dictionary where keys are column names and values are data.
+            conflict_columns (tuple[str]): Columns of the UNIQUE constraint identifying the record.
+        Returns:
+            int: The ID of the inserted or updated row.
+        """
+        query = self._upsert_query(table_name, list(data.keys()), conflict_columns) + " RETURNING id"
+        return self._execute_returning(query, tuple(data.values()))['id']
+
+    def upsert_many(self, table_name, rows, conflict_columns, skip_unchanged=False):
+        """
+        Inserts or updates several records with a single executemany() call
+        inside one transaction (or the enclosing transaction()).
+        Args:
+            table_name (str): The name of the table.
+            rows (list[dict]): The records to write; all must have the same keys.
+            conflict_columns (tuple[str]): Columns of the UNIQUE constraint identifying a record.
+            skip_unchanged (bool, optional): Leave existing records whose values already
+                                             match untouched instead of rewriting them.
+                                             Defaults to False.
+        Returns:
+            int: Number of rows inserted or updated.
+        """
+        if not rows:
+            return 0
+        columns = list(rows[0].keys())
+        query = self._upsert_query(table_name, columns, conflict_columns, skip_unchanged)
+        return self._execute_many(query, columns, rows)
+
+    def _upsert_query(self, table_name, columns, conflict_columns, skip_unchanged=False):
+        """
+        Builds an INSERT ... ON CONFLICT DO UPDATE statement that overwrites
+        every column outside conflict_columns, optionally only when one of them differs.
+        """
+        placeholders = ', '.join(['?' for _ in columns])
+        updated_columns = [c for c in columns if c not in conflict_columns]
+        updates = ', '.join(f"{c} = excluded.{c}" for c in updated_columns)
+        query = (f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders}) "
+                 f"ON CONFLICT({', '.join(conflict_columns)}) DO UPDATE SET {updates}")
+        if skip_unchanged:
+            query += " WHERE " + ' OR '.join(f"{c} IS NOT excluded.{c}" for c in updated_columns)
+        return query
+
+    def _execute_returning(self, query, params):
+        """
+        Runs a write statement with a RETURNING clause and returns the row it produced.
+        """
+        try:
+            # RETURNING rows must be read before the transaction commits
+            with self.transaction() as conn:
+                row = conn.execute(query, params).fetchone()
+        except sqlite3.Error as e:
+            logger.debug("Database error: %s", e) # The caller handles and reports it
+            raise
+        self._mark_written(query)
+        return dict(row)
+
+    def _execute_many(self, query, columns, rows):
+        """
+        Runs a write statement once per row with executemany(), committing once
+        at the end or rolling back the whole batch.
+        """
+        try:
+            with self.transaction() as conn:
+                cursor = conn.executemany(query, [tuple(row[c] for c in columns) for row in rows])
+        except sqlite3.Error as e:
+            logger.debug("Database error: %s", e) # The caller handles and reports it
+            raise
+        self._mark_written(query)
+        return cursor.rowcount
 
     def update_one(self, table_name, record_id, data):
         """
@@ -96,6 +371,24 @@ class DBManager:
         cursor = self.execute_query(query, params)
         return cursor.rowcount
 
+    def update_many(self, table_name, rows):
+        """
+        Updates several records by their IDs with a single executemany() call
+        inside one transaction (or the enclosing transaction()).
+        Args:
+            table_name (str): The name of the table.
+            rows (list[dict]): The records to update, each with an 'id' key and the
+                               new column values; all must have the same keys.
+        Returns:
+            int: Number of rows updated.
+        """
+        if not rows:
+            return 0
+        columns = [c for c in rows[0].keys() if c != 'id']
+        set_clause = ', '.join([f"{c} = ?" for c in columns])
+        query = f"UPDATE {table_name} SET {set_clause} WHERE id = ?"
+        return self._execute_many(query, columns + ['id'], rows)
+
     def delete_one(self, table_name, record_id):
         """
         Deletes a single record from the specified table by its ID.
@@ -135,6 +428,23 @@ class DBManager:
         query = f"SELECT * FROM {table_name} WHERE id = ?"
         return self.fetch_one(query, (record_id,))
 
+
+_default_db_manager = None
+_default_db_manager_lock = threading.Lock()
+
+def get_default_db_manager():
+    """
+    Returns the DBManager shared by all services.
+    The instance (and its connection) is created lazily on first use, so the
+    schema check and connection setup happen once per process instead of once
+    per service.
+    """
+    global _default_db_manager
+    with _default_db_manager_lock:
+        if _default_db_manager is None:
+            _default_db_manager = DBManager()
+    return _default_db_manager
+
 # Example Usage (for testing purposes)
 if __name__ == '__main__':
     db_manager = DBManager()
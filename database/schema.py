@@ -1,13 +1,25 @@
+import logging
 import sqlite3
+from models.exam import EXAM_TYPE_SEMESTER_EXAM, EXAM_TYPE_CAT
+
+logger = logging.getLogger(__name__)
 
 DATABASE_NAME = 'sms.db'
 
+# Classifies an exam by its name for the result computations; NULL for any other exam.
+# Kept in SQL so every insert and rename updates it.
+_EXAM_TYPE_EXPRESSION = (
+    f"CASE WHEN name LIKE '%Semester%Exam%' THEN {EXAM_TYPE_SEMESTER_EXAM} "
+    f"WHEN name LIKE '%CAT%' THEN {EXAM_TYPE_CAT} END")
+
 def create_schema():
     """
     Creates the necessary tables for the Students Management System database.
     """
     conn = sqlite3.connect(DATABASE_NAME)
     cursor = conn.cursor()
+    # Bumped by SQLite on every CREATE/DROP that changes something
+    schema_version = cursor.execute('PRAGMA schema_version').fetchone()[0]
 
     # Table: Grades (e.g., Grade 1, Grade 8)
     cursor.execute('''
@@ -74,18 +86,24 @@ def create_schema():
     ''')
 
     # Table: Exams (e.g., Semester 1 Exam, CAT 1, CAT 2)
-    cursor.execute('''
+    cursor.execute(f'''
         CREATE TABLE IF NOT EXISTS Exams (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL,
             semester_id INTEGER, -- Can be NULL for yearly exams if needed, but for now tied to semester
             academic_year_id INTEGER NOT NULL,
             max_marks INTEGER DEFAULT 100, -- Default max marks for an exam
+            exam_type INTEGER GENERATED ALWAYS AS ({_EXAM_TYPE_EXPRESSION}) VIRTUAL, -- Derived from the name
             UNIQUE(name, semester_id, academic_year_id), -- Ensure unique exam per semester/year
             FOREIGN KEY (semester_id) REFERENCES Semesters(id),
             FOREIGN KEY (academic_year_id) REFERENCES AcademicYears(id)
         )
     ''')
+    # Databases created before exam_type existed; table_xinfo also lists generated columns
+    exam_columns = {row[1] for row in cursor.execute('PRAGMA table_xinfo(Exams)')}
+    if 'exam_type' not in exam_columns:
+        cursor.execute(
+            f'ALTER TABLE Exams ADD COLUMN exam_type INTEGER GENERATED ALWAYS AS ({_EXAM_TYPE_EXPRESSION}) VIRTUAL')
 
     # Table: ExamResults (Individual student scores for a subject in a specific exam)
     cursor.execute('''
@@ -134,7 +152,76 @@ def create_schema():
         )
     ''')
 
+    # Indexes on the foreign-key columns used in WHERE/JOIN clauses.
+    # Lookups on Enrollments.student_id are already served by the UNIQUE constraint
+    # above, which starts with that column.
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_enroll_ay_grade
+        ON Enrollments (academic_year_id, grade_id)
+    ''')
+    # Students of a grade, already in name order (student lists and per-grade counts)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_students_grade
+        ON Students (current_grade_id, name)
+    ''')
+    # Covers the per-exam reads of ExamResults (the semester result computation and
+    # results by exam and subject), so they never touch the table itself
+    cursor.execute('DROP INDEX IF EXISTS ix_results_exam_subject') # Superseded by the index below
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_results_exam_covering
+        ON ExamResults (exam_id, subject_id, student_id, marks)
+    ''')
+    # The per-student counterpart: a student's results (by exam) are read from the
+    # index alone. The UNIQUE constraint's index has the same key but not marks.
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_results_student_covering
+        ON ExamResults (student_id, exam_id, subject_id, marks)
+    ''')
+
+    # The yearly result computation reads a year's semester totals and averages
+    # per student from this index alone
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_sem_results_ay_covering
+        ON SemesterResults (academic_year_id, student_id, total_marks, average_score)
+    ''')
+    # Yearly results of an academic year (per-grade listings). Lookups by student
+    # are served by the UNIQUE(student_id, academic_year_id) constraint's index.
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_yearly_results_ay
+        ON YearlyResults (academic_year_id)
+    ''')
+
+    # Lets the exam listings walk AcademicYears in year_name order (via its UNIQUE index)
+    # and fetch each year's exams from this index, so SQLite only sorts within a year.
+    # Also finds a period's semester exams and CATs by exam_type.
+    cursor.execute('DROP INDEX IF EXISTS ix_exams_ay_sem_name') # Superseded by the index below
+    cursor.execute('DROP INDEX IF EXISTS ix_exams_ay_sem_type') # Superseded by the index below
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS ix_exams_ay_sem_type_name
+        ON Exams (academic_year_id, semester_id, exam_type, name)
+    ''')
+
+    # One exam per name and period. Unlike the UNIQUE constraint on Exams, this also
+    # covers yearly exams (NULL semester_id), and serves get_exam_by_name_and_period.
+    try:
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_exam_period
+            ON Exams (name, academic_year_id, COALESCE(semester_id, -1))
+        ''')
+    except sqlite3.IntegrityError:
+        logger.warning("Duplicate yearly exams found; index ux_exam_period not created.")
+
     conn.commit()
+    # Gather the planner statistics the indexes above rely on when there are none yet
+    # or the schema just changed; analysis_limit keeps ANALYZE fast on large tables by
+    # sampling. Otherwise PRAGMA optimize only re-analyzes tables that need it.
+    stats_exist = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'").fetchone()
+    cursor.execute('PRAGMA analysis_limit=400')
+    if not stats_exist or cursor.execute('PRAGMA schema_version').fetchone()[0] != schema_version:
+        cursor.execute('ANALYZE')
+    else:
+        cursor.execute('PRAGMA optimize')
     conn.close()
     print(f"Database schema created/verified in {DATABASE_NAME}")
 
@@ -1,17 +1,24 @@
 from gui.main_window import StudentManagementApp
 from database.schema import create_schema  # To ensure database is set up on app start
+from utils.logging_config import configure_logging
 
 
 def main():
     """
     Main function to initialize the database and run the GUI application.
     """
+    # Library code only logs; the application decides where messages go
+    log_listener = configure_logging()
+
     # Ensure the database schema is created/updated
     create_schema()
 
     # Run the GUI application
-    app = StudentManagementApp()
-    app.mainloop()
+    try:
+        app = StudentManagementApp()
+        app.mainloop()
+    finally:
+        log_listener.stop() # Flush queued log records
 
 
 if __name__ == "__main__":
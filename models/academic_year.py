@@ -41,6 +41,17 @@ class AcademicYear:
             end_date=data.get('end_date')
         )
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Creates an AcademicYear object from a database row (e.g., a sqlite3.Row or tuple)
+        whose columns are id, year_name, start_date, end_date, in that order.
+        Unpacks the columns by position, without building an intermediate dictionary.
+        """
+        academic_year = cls.__new__(cls)
+        academic_year.id, academic_year.year_name, academic_year.start_date, academic_year.end_date = row
+        return academic_year
+
     def __repr__(self):
         return (f"AcademicYear(id={self.id}, year_name='{self.year_name}', "
                 f"start_date='{self.start_date}', end_date='{self.end_date}')")
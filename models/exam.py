@@ -1,8 +1,16 @@
+# Values of the Exams.exam_type column, derived from the exam name by the database
+EXAM_TYPE_SEMESTER_EXAM = 0 # e.g. "Semester 1 Exam"
+EXAM_TYPE_CAT = 1 # e.g. "CAT 1", "CAT 2"
+
+
 class Exam:
     """
     Represents an exam or continuous assessment test (CAT).
     Corresponds to the 'Exams' table in the database.
     """
+    # No per-instance __dict__: exams are built once per row in list endpoints
+    __slots__ = ('id', 'name', 'semester_id', 'academic_year_id', 'max_marks')
+
     def __init__(self, id=None, name=None, semester_id=None, academic_year_id=None, max_marks=None):
         """
         Initializes an Exam object.
@@ -45,6 +53,17 @@ class Exam:
             max_marks=data.get('max_marks')
         )
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Creates an Exam object from a database row (e.g., a sqlite3.Row or tuple) whose
+        columns are id, name, semester_id, academic_year_id, max_marks, in that order.
+        Unpacks the columns by position, without building an intermediate dictionary.
+        """
+        exam = cls.__new__(cls)
+        exam.id, exam.name, exam.semester_id, exam.academic_year_id, exam.max_marks = row
+        return exam
+
     def __repr__(self):
         return (f"Exam(id={self.id}, name='{self.name}', semester_id={self.semester_id}, "
                 f"academic_year_id={self.academic_year_id}, max_marks={self.max_marks})")
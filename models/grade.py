@@ -3,6 +3,9 @@ class Grade:
     Represents a grade level (e.g., Grade 1, Grade 8).
     Corresponds to the 'Grades' table in the database.
     """
+    # No per-instance __dict__: grades are built once per row in list endpoints
+    __slots__ = ('id', 'name', 'description')
+
     def __init__(self, id=None, name=None, description=None):
         """
         Initializes a Grade object.
@@ -37,6 +40,17 @@ class Grade:
             description=data.get('description')
         )
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Creates a Grade object from a database row (e.g., a sqlite3.Row or tuple) whose
+        columns are id, name, description, in that order.
+        Unpacks the columns by position, without building an intermediate dictionary.
+        """
+        grade = cls.__new__(cls)
+        grade.id, grade.name, grade.description = row
+        return grade
+
     def __repr__(self):
         return f"Grade(id={self.id}, name='{self.name}', description='{self.description}')"
 
@@ -41,6 +41,17 @@ class Semester:
             end_date=data.get('end_date')
         )
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Creates a Semester object from a database row (e.g., a sqlite3.Row or tuple) whose
+        columns are id, name, start_date, end_date, in that order.
+        Unpacks the columns by position, without building an intermediate dictionary.
+        """
+        semester = cls.__new__(cls)
+        semester.id, semester.name, semester.start_date, semester.end_date = row
+        return semester
+
     def __repr__(self):
         return (f"Semester(id={self.id}, name='{self.name}', "
                 f"start_date='{self.start_date}', end_date='{self.end_date}')")
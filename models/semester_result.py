@@ -54,6 +54,19 @@ class SemesterResult:
             grade_rank=data.get('grade_rank')
         )
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Creates a SemesterResult object from a database row (e.g., a sqlite3.Row or tuple)
+        whose columns are id, student_id, semester_id, academic_year_id, total_marks,
+        average_score, grade_rank, in that order.
+        Unpacks the columns by position, without building an intermediate dictionary.
+        """
+        result = cls.__new__(cls)
+        (result.id, result.student_id, result.semester_id, result.academic_year_id,
+         result.total_marks, result.average_score, result.grade_rank) = row
+        return result
+
     def __repr__(self):
         return (f"SemesterResult(id={self.id}, student_id={self.student_id}, "
                 f"semester_id={self.semester_id}, academic_year_id={self.academic_year_id}, "
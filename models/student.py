@@ -48,6 +48,17 @@ class Student:
             current_grade_id=data.get('current_grade_id')
         )
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Creates a Student object from a database row (e.g., a sqlite3.Row or tuple) whose
+        columns are id, name, student_id, contact_info, current_grade_id, in that order.
+        Unpacks the columns by position, without building an intermediate dictionary.
+        """
+        student = cls.__new__(cls)
+        student.id, student.name, student.student_id, student.contact_info, student.current_grade_id = row
+        return student
+
     def __repr__(self):
         return (f"Student(id={self.id}, name='{self.name}', "
                 f"student_id='{self.student_id}', contact_info='{self.contact_info}', "
@@ -37,6 +37,17 @@ class Subject:
             description=data.get('description')
         )
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Creates a Subject object from a database row (e.g., a sqlite3.Row or tuple) whose
+        columns are id, name, description, in that order.
+        Unpacks the columns by position, without building an intermediate dictionary.
+        """
+        subject = cls.__new__(cls)
+        subject.id, subject.name, subject.description = row
+        return subject
+
     def __repr__(self):
         return f"Subject(id={self.id}, name='{self.name}', description='{self.description}')"
 
@@ -50,6 +50,19 @@ class YearlyResult:
             grade_rank=data.get('grade_rank')
         )
 
+    @classmethod
+    def from_row(cls, row):
+        """
+        Creates a YearlyResult object from a database row (e.g., a sqlite3.Row or tuple)
+        whose columns are id, student_id, academic_year_id, total_marks, average_score,
+        grade_rank, in that order.
+        Unpacks the columns by position, without building an intermediate dictionary.
+        """
+        result = cls.__new__(cls)
+        (result.id, result.student_id, result.academic_year_id,
+         result.total_marks, result.average_score, result.grade_rank) = row
+        return result
+
     def __repr__(self):
         return (f"YearlyResult(id={self.id}, student_id={self.student_id}, "
                 f"academic_year_id={self.academic_year_id}, total_marks={self.total_marks}, "
@@ -0,0 +1 @@
+# This file makes the 'scripts' directory a Python package.
@@ -0,0 +1,155 @@
+# Example usage of SemesterResultService (for testing purposes).
+# Run from the project root with: python -m scripts.seed_semester_results
+from services.semester_result_service import SemesterResultService
+from services.grade_service import GradeService
+from services.student_service import StudentService
+from services.subject_service import SubjectService
+from services.academic_year_service import AcademicYearService
+from services.semester_service import SemesterService
+from services.exam_service import ExamService
+
+if __name__ == '__main__':
+    semester_result_service = SemesterResultService()
+    db_manager = semester_result_service.db_manager # Same shared instance, for fetching IDs for testing
+
+    # --- Setup Test Data (ensure these exist from previous tests or insert them) ---
+    # Reference data. Rows that already exist (by their UNIQUE name or ID) are skipped,
+    # so re-running the script adds nothing; the IDs are then looked up by name.
+    grade_service = GradeService(db_manager)
+    student_service = StudentService(db_manager)
+    subject_service = SubjectService(db_manager)
+    academic_year_service = AcademicYearService(db_manager)
+    semester_service = SemesterService(db_manager)
+    exam_service = ExamService(db_manager)
+
+    # Grades
+    grade_service.add_grades([{'name': 'Grade 1'}, {'name': 'Grade 2'}, {'name': 'Grade 8'}])
+    grade1_id = grade_service.get_grade_by_name('Grade 1').id
+    grade2_id = grade_service.get_grade_by_name('Grade 2').id
+    grade8_id = grade_service.get_grade_by_name('Grade 8').id
+
+    # Academic Year and Semesters
+    db_manager.insert_one('AcademicYears', {'year_name': '2023/2024', 'start_date': '2023-09-01',
+                                            'end_date': '2024-07-31'}, ignore_duplicates=True)
+    db_manager.insert_many('Semesters', [
+        {'name': 'Semester 1', 'start_date': '2023-09-01', 'end_date': '2024-01-31'},
+        {'name': 'Semester 2', 'start_date': '2024-02-01', 'end_date': '2024-07-31'},
+    ], ignore_duplicates=True)
+    ay_2023_2024_id = academic_year_service.get_academic_year_by_name('2023/2024').id
+    sem1_id = semester_service.get_semester_by_name('Semester 1').id
+    sem2_id = semester_service.get_semester_by_name('Semester 2').id
+
+    # Students (ensure their current_grade_id is set correctly for ranking)
+    student_service.add_students([
+        {'name': 'John Doe', 'student_id': 'S001', 'contact_info': 'john@example.com', 'current_grade_id': grade1_id},
+        # Jane also in Grade 1 for ranking test
+        {'name': 'Jane Smith', 'student_id': 'S002', 'contact_info': 'jane@example.com', 'current_grade_id': grade1_id},
+        {'name': 'Mike Brown', 'student_id': 'S003', 'contact_info': 'mike@example.com', 'current_grade_id': grade2_id},
+    ])
+    student_john_id = student_service.get_student_by_unique_id('S001').id
+    student_jane_id = student_service.get_student_by_unique_id('S002').id
+    student_mike_id = student_service.get_student_by_unique_id('S003').id
+
+    # Subjects
+    db_manager.insert_many('Subjects', [{'name': 'Mathematics'}, {'name': 'Science'}, {'name': 'English'}],
+                           ignore_duplicates=True)
+    math_id = subject_service.get_subject_by_name('Mathematics').id
+    science_id = subject_service.get_subject_by_name('Science').id
+    english_id = subject_service.get_subject_by_name('English').id
+
+    # Enrollments (important for `compute_and_store_semester_results` to find students)
+    # Already-enrolled students are skipped, so re-running the script adds nothing
+    db_manager.insert_many('Enrollments', [
+        {'student_id': student_john_id, 'academic_year_id': ay_2023_2024_id, 'grade_id': grade1_id},
+        {'student_id': student_jane_id, 'academic_year_id': ay_2023_2024_id, 'grade_id': grade1_id},
+        {'student_id': student_mike_id, 'academic_year_id': ay_2023_2024_id, 'grade_id': grade2_id},
+    ], ignore_duplicates=True)
+
+    # Exams
+    exam_service.add_exams([
+        {'name': 'Semester 1 Exam', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem1_id, 'max_marks': 100},
+        {'name': 'CAT 1', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem1_id, 'max_marks': 30},
+        {'name': 'CAT 2', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem1_id, 'max_marks': 30},
+    ])
+    exam_s1_23_id = exam_service.get_exam_by_name_and_period('Semester 1 Exam', ay_2023_2024_id, sem1_id).id
+    cat1_s1_23_id = exam_service.get_exam_by_name_and_period('CAT 1', ay_2023_2024_id, sem1_id).id
+    cat2_s1_23_id = exam_service.get_exam_by_name_and_period('CAT 2', ay_2023_2024_id, sem1_id).id
+
+    # Exam Results (ensure these are added before computing semester results)
+    # Results that already exist are skipped, so re-running the script adds nothing
+    db_manager.insert_many('ExamResults', [
+        # John Doe (Grade 1)
+        {'student_id': student_john_id, 'exam_id': exam_s1_23_id, 'subject_id': math_id, 'marks': 70},
+        {'student_id': student_john_id, 'exam_id': cat1_s1_23_id, 'subject_id': math_id, 'marks': 25},
+        {'student_id': student_john_id, 'exam_id': cat2_s1_23_id, 'subject_id': math_id, 'marks': 28},
+        {'student_id': student_john_id, 'exam_id': exam_s1_23_id, 'subject_id': science_id, 'marks': 65},
+        {'student_id': student_john_id, 'exam_id': cat1_s1_23_id, 'subject_id': science_id, 'marks': 20},
+        {'student_id': student_john_id, 'exam_id': cat2_s1_23_id, 'subject_id': science_id, 'marks': 22},
+        # Jane Smith (Grade 1)
+        {'student_id': student_jane_id, 'exam_id': exam_s1_23_id, 'subject_id': math_id, 'marks': 80},
+        {'student_id': student_jane_id, 'exam_id': cat1_s1_23_id, 'subject_id': math_id, 'marks': 28},
+        {'student_id': student_jane_id, 'exam_id': cat2_s1_23_id, 'subject_id': math_id, 'marks': 29},
+        {'student_id': student_jane_id, 'exam_id': exam_s1_23_id, 'subject_id': english_id, 'marks': 75},
+        {'student_id': student_jane_id, 'exam_id': cat1_s1_23_id, 'subject_id': english_id, 'marks': 26},
+        {'student_id': student_jane_id, 'exam_id': cat2_s1_23_id, 'subject_id': english_id, 'marks': 27},
+        # Mike Brown (Grade 2)
+        {'student_id': student_mike_id, 'exam_id': exam_s1_23_id, 'subject_id': math_id, 'marks': 90},
+        {'student_id': student_mike_id, 'exam_id': cat1_s1_23_id, 'subject_id': math_id, 'marks': 29},
+        {'student_id': student_mike_id, 'exam_id': cat2_s1_23_id, 'subject_id': math_id, 'marks': 30},
+    ], ignore_duplicates=True)
+
+    print("\n--- Testing SemesterResultService ---")
+
+    # Compute and store semester results
+    semester_result_service.compute_and_store_semester_results(ay_2023_2024_id, sem1_id)
+
+    # Get all semester results
+    print("\nAll Semester Results:")
+    all_semester_results = semester_result_service.get_all_semester_results()
+    for r in all_semester_results:
+        print(r)
+
+    # Get semester results for a specific student
+    if student_john_id:
+        print(f"\nSemester Results for John Doe (ID: {student_john_id}):")
+        john_semester_results = semester_result_service.get_semester_results_for_student(student_john_id)
+        for r in john_semester_results:
+            print(r)
+
+    # Get semester results by academic year and grade
+    if ay_2023_2024_id and grade1_id:
+        print(f"\nSemester Results for 2023/2024, Grade 1:")
+        grade1_semester_results = semester_result_service.get_semester_results_by_academic_year_and_grade(
+            ay_2023_2024_id, grade1_id)
+        for r in grade1_semester_results:
+            print(r)
+
+    # Update a semester result (e.g., if re-computation changes rank or scores)
+    # This is typically handled by `compute_and_store_semester_results` itself
+    # but provided for direct update capability if needed.
+    # if all_semester_results:
+    #     first_result_id = all_semester_results[0]['id']
+    #     print(f"\nUpdating first semester result (ID: {first_result_id})...")
+    #     updated = semester_result_service.update_semester_result(first_result_id, total_marks=150.0, average_score=75.0, grade_rank=99)
+    #     if updated:
+    #         updated_result = semester_result_service.get_semester_result_by_id(first_result_id)
+    #         print(f"Updated: {updated_result}")
+    #     else:
+    #         print("Failed to update semester result.")
+
+    # Delete a semester result (use with caution)
+    # if all_semester_results:
+    #     last_result_id = all_semester_results[-1]['id']
+    #     print(f"\nDeleting last semester result (ID: {last_result_id})...")
+    #     deleted = semester_result_service.delete_semester_result(last_result_id)
+    #     if deleted:
+    #         print("Semester result deleted successfully.")
+    #     else:
+    #         print("Failed to delete semester result.")
+
+    print("\nAll Semester Results after operations:")
+    all_semester_results_after = semester_result_service.get_all_semester_results()
+    for r in all_semester_results_after:
+        print(r)
+
+    db_manager.close_connection()  # Close connection after testing
@@ -0,0 +1,54 @@
+# Example usage of SemesterService (for testing purposes).
+# Run from the project root with: python -m scripts.seed_semesters
+from services.semester_service import SemesterService
+
+if __name__ == '__main__':
+    semester_service = SemesterService()
+
+    print("\n--- Testing SemesterService ---")
+
+    # Add semesters (Semester 1 and Semester 2 should be in schema.py initial setup)
+    print("Adding extra semester 'Summer Term'...")
+    summer_term = semester_service.add_semester("Summer Term", "2024-07-01", "2024-08-31")
+    if summer_term:
+        print(f"Added: {summer_term}")
+    else:
+        print("Failed to add Summer Term (might already exist).")
+
+    # Get all semesters
+    print("\nAll Semesters:")
+    all_semesters = semester_service.get_all_semesters()
+    for s in all_semesters:
+        print(s)
+
+    # Update a semester
+    if summer_term:
+        print(f"\nUpdating Summer Term (ID: {summer_term.id})...")
+        updated = semester_service.update_semester(summer_term.id, end_date="2024-09-15")
+        if updated:
+            updated_sem = semester_service.get_semester_by_id(summer_term.id)
+            print(f"Updated: {updated_sem}")
+        else:
+            print("Failed to update Summer Term.")
+
+    # Get semester by name
+    print("\nGetting semester by name 'Semester 1':")
+    found_sem1 = semester_service.get_semester_by_name("Semester 1")
+    if found_sem1:
+        print(f"Found: {found_sem1}")
+    else:
+        print("Semester 1 not found.")
+
+    # Delete a semester (use with caution)
+    # if summer_term:
+    #     print(f"\nDeleting Summer Term (ID: {summer_term.id})...")
+    #     deleted = semester_service.delete_semester(summer_term.id)
+    #     if deleted:
+    #         print("Summer Term deleted successfully.")
+    #     else:
+    #         print("Failed to delete Summer Term.")
+
+    print("\nAll Semesters after operations:")
+    all_semesters_after = semester_service.get_all_semesters()
+    for s in all_semesters_after:
+        print(s)
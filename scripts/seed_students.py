@@ -0,0 +1,67 @@
+# Example usage of StudentService (for testing purposes).
+# Run from the project root with: python -m scripts.seed_students
+from services.student_service import StudentService
+
+if __name__ == '__main__':
+    student_service = StudentService()
+
+    # Ensure some grades exist for testing
+    db_manager = student_service.db_manager # Same shared instance
+    db_manager.insert_many('Grades', [
+        {'name': 'Grade 1', 'description': 'First year'},
+        {'name': 'Grade 8', 'description': 'Final year'},
+    ], ignore_duplicates=True)
+    grade1_id = db_manager.fetch_one("SELECT id FROM Grades WHERE name = ?", ('Grade 1',))['id']
+    grade8_id = db_manager.fetch_one("SELECT id FROM Grades WHERE name = ?", ('Grade 8',))['id']
+
+    print("\n--- Testing StudentService ---")
+
+    # Add students
+    print("Adding John Doe and Jane Smith...")
+    added = student_service.add_students([
+        {'name': "John Doe", 'student_id': "S001", 'contact_info': "john@example.com", 'current_grade_id': grade1_id},
+        {'name': "Jane Smith", 'student_id': "S002", 'contact_info': "jane@example.com", 'current_grade_id': grade8_id},
+    ])
+    print(f"Added {added} student(s).")
+    john = student_service.get_student_by_unique_id("S001")
+    jane = student_service.get_student_by_unique_id("S002")
+
+    # Get all students
+    print("\nAll Students:")
+    all_students = student_service.get_all_students()
+    for s in all_students:
+        print(s)
+
+    # Update a student
+    if john:
+        print(f"\nUpdating John Doe (ID: {john.id})...")
+        updated = student_service.update_student(john.id, contact_info="john.new@example.com", current_grade_id=grade8_id)
+        if updated:
+            updated_john = student_service.get_student_by_id(john.id)
+            print(f"Updated: {updated_john}")
+        else:
+            print("Failed to update John Doe.")
+
+    # Get student by unique ID
+    print("\nGetting student by unique ID 'S002':")
+    found_jane = student_service.get_student_by_unique_id("S002")
+    if found_jane:
+        print(f"Found: {found_jane}")
+    else:
+        print("Student S002 not found.")
+
+    # Delete a student
+    if john:
+        print(f"\nDeleting John Doe (ID: {john.id})...")
+        deleted = student_service.delete_student(john.id)
+        if deleted:
+            print("John Doe deleted successfully.")
+        else:
+            print("Failed to delete John Doe.")
+
+    print("\nAll Students after deletion:")
+    all_students_after_delete = student_service.get_all_students()
+    for s in all_students_after_delete:
+        print(s)
+
+    db_manager.close_connection() # Close connection after testing
@@ -0,0 +1,54 @@
+# Example usage of SubjectService (for testing purposes).
+# Run from the project root with: python -m scripts.seed_subjects
+from services.subject_service import SubjectService
+
+if __name__ == '__main__':
+    subject_service = SubjectService()
+
+    print("\n--- Testing SubjectService ---")
+
+    # Add subjects (these should already be in schema.py initial setup)
+    print("Adding extra subject 'Computer Science'...")
+    cs_subject = subject_service.add_subject("Computer Science", "Study of computation and algorithms")
+    if cs_subject:
+        print(f"Added: {cs_subject}")
+    else:
+        print("Failed to add Computer Science (might already exist).")
+
+    # Get all subjects
+    print("\nAll Subjects:")
+    all_subjects = subject_service.get_all_subjects()
+    for s in all_subjects:
+        print(s)
+
+    # Update a subject
+    if cs_subject:
+        print(f"\nUpdating Computer Science (ID: {cs_subject.id})...")
+        updated = subject_service.update_subject(cs_subject.id, description="Updated description for CS")
+        if updated:
+            updated_cs = subject_service.get_subject_by_id(cs_subject.id)
+            print(f"Updated: {updated_cs}")
+        else:
+            print("Failed to update Computer Science.")
+
+    # Get subject by name
+    print("\nGetting subject by name 'Mathematics':")
+    found_math = subject_service.get_subject_by_name("Mathematics")
+    if found_math:
+        print(f"Found: {found_math}")
+    else:
+        print("Mathematics not found.")
+
+    # Delete a subject (use with caution during testing if results are linked)
+    # if cs_subject:
+    #     print(f"\nDeleting Computer Science (ID: {cs_subject.id})...")
+    #     deleted = subject_service.delete_subject(cs_subject.id)
+    #     if deleted:
+    #         print("Computer Science deleted successfully.")
+    #     else:
+    #         print("Failed to delete Computer Science.")
+
+    print("\nAll Subjects after operations:")
+    all_subjects_after = subject_service.get_all_subjects()
+    for s in all_subjects_after:
+        print(s)
@@ -0,0 +1,85 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+def _copy(value):
+    """
+    Copies a cached value for a caller: lists element by element, and dictionaries
+    (rows) and model objects one level deep, which is all they hold.
+    """
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, dict):
+        return dict(value)
+    if value is None or isinstance(value, (int, float, str, tuple)):
+        return value
+    return copy.copy(value)
+
+
+class QueryCache:
+    """
+    A small in-process LRU cache for query results with a time-to-live.
+    Each entry remembers the tables it was read from and is discarded as soon
+    as any of those tables is written through the DBManager, so results never
+    outlive a change made by any service sharing the same DBManager.
+    Every caller gets its own copy of a cached value, so changing a returned row
+    or object can't affect the cache.
+    """
+    def __init__(self, db_manager, maxsize=128, ttl=30):
+        """
+        Initializes the QueryCache.
+
+        Args:
+            db_manager (DBManager): The DBManager whose table versions are tracked.
+            maxsize (int, optional): Maximum number of cached results. Defaults to 128.
+            ttl (float, optional): Seconds an entry stays valid. Defaults to 30.
+        """
+        self.db_manager = db_manager
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock() # Services may be called from worker threads
+
+    def get(self, key, tables, loader):
+        """
+        Returns the cached value for key, calling loader() to (re)build it
+        when missing, expired, or invalidated by a write to one of the tables.
+
+        Args:
+            key (hashable): The cache key.
+            tables (tuple[str]): Tables the value depends on.
+            loader (callable): Produces the value on a cache miss.
+        """
+        versions = tuple(self.db_manager.table_version(t) for t in tables)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, cached_versions = entry
+                if expires_at > now and cached_versions == versions:
+                    self._entries.move_to_end(key)
+                    return _copy(value)
+
+        value = loader() # Outside the lock, so a slow query doesn't block other keys
+        with self._lock:
+            self._entries[key] = (value, now + self.ttl, versions)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return _copy(value)
+
+    def fetch_all(self, query, params=(), tables=()):
+        """
+        Cached equivalent of DBManager.fetch_all, keyed on the SQL text and parameters.
+        """
+        return self.get((query, tuple(params)), tables,
+                        lambda: self.db_manager.fetch_all(query, params))
+
+    def clear(self):
+        """
+        Drops every cached entry.
+        """
+        with self._lock:
+            self._entries.clear()
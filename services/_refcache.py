@@ -0,0 +1,131 @@
+import copy
+from types import MappingProxyType
+
+class ReferenceCache:
+    """
+    An in-memory copy of the small reference tables (grades, academic years, and
+    subjects) that rarely change but are joined by most listings.
+    Each table is loaded with a single query on first use and reloaded after it
+    is written through the DBManager. Tables and rows are handed out as read-only
+    views, since every lookup shares them.
+    """
+    _TABLES = {
+        'grades': 'Grades',
+        'academic_years': 'AcademicYears',
+        'subjects': 'Subjects',
+    }
+
+    def __init__(self, db_manager):
+        """
+        Initializes the ReferenceCache.
+
+        Args:
+            db_manager (DBManager): The DBManager used to load the tables.
+        """
+        self.db_manager = db_manager
+        self._rows = {} # name -> (table version, {id: row})
+
+    def get(self, name):
+        """
+        Returns the rows of a reference table keyed by ID.
+
+        Args:
+            name (str): 'grades', 'academic_years', or 'subjects'.
+
+        Returns:
+            Mapping[int, Mapping]: Every row of the table, keyed by its ID (read-only).
+        """
+        table_name = self._TABLES[name]
+        version = self.db_manager.table_version(table_name)
+        cached = self._rows.get(name)
+        if cached is None or cached[0] != version:
+            rows = self.db_manager.get_all(table_name)
+            cached = (version, MappingProxyType({row['id']: MappingProxyType(row) for row in rows}))
+            self._rows[name] = cached
+        return cached[1]
+
+    @property
+    def grades(self):
+        return self.get('grades')
+
+    @property
+    def academic_years(self):
+        return self.get('academic_years')
+
+    @property
+    def subjects(self):
+        return self.get('subjects')
+
+    def clear(self):
+        """
+        Drops every cached table, so the next lookup reloads it.
+        """
+        self._rows.clear()
+
+
+class ModelCache:
+    """
+    An in-memory copy of a small, rarely changing table as model objects, with
+    lookups by ID and by name. Meant to be held as a class attribute so every
+    service instance shares it; reloaded with a single query when the table
+    version changes (any write through a DBManager).
+    Callers get copies of the cached objects, so changing one can't affect the cache.
+    """
+
+    def __init__(self, table_name, query, model):
+        """
+        Initializes the ModelCache.
+
+        Args:
+            table_name (str): The table whose version invalidates the cache.
+            query (str): Selects every row in the column order of model.from_row().
+            model (type): The model class with a from_row() constructor.
+        """
+        self.table_name = table_name
+        self.query = query
+        self.model = model
+        self._state = {'version': None, 'all': [], 'by_id': {}, 'by_name': {}, 'names': {}}
+
+    def _load(self, db_manager):
+        """
+        Returns the cached state, reloading it if the table has been written since it was built.
+        """
+        state = self._state
+        version = db_manager.table_version(self.table_name)
+        if state['version'] != version:
+            rows = db_manager.execute_query(self.query).fetchall()
+            items = [self.model.from_row(row) for row in rows]
+            # Replaced as a whole so other threads never see a half-built cache
+            state = {
+                'version': version,
+                'all': items,
+                'by_id': {item.id: item for item in items},
+                'by_name': {item.name: item for item in items},
+                'names': MappingProxyType({item.id: item.name for item in items}),
+            }
+            self._state = state
+        return state
+
+    def get_by_id(self, db_manager, item_id):
+        item = self._load(db_manager)['by_id'].get(item_id)
+        return copy.copy(item) if item else None
+
+    def get_by_name(self, db_manager, name):
+        item = self._load(db_manager)['by_name'].get(name)
+        return copy.copy(item) if item else None
+
+    def get_all(self, db_manager):
+        return [copy.copy(item) for item in self._load(db_manager)['all']]
+
+    def names(self, db_manager):
+        """
+        Returns a read-only mapping of ID to name, for labelling many rows without
+        copying an object per row.
+        """
+        return self._load(db_manager)['names']
+
+    def clear(self):
+        """
+        Forces the next lookup to reload the table.
+        """
+        self._state = dict(self._state, version=None)
@@ -1,16 +1,30 @@
-from database.db_manager import DBManager
+import logging
+from database.db_manager import get_default_db_manager
 from models.academic_year import AcademicYear
 
+logger = logging.getLogger(__name__)
+
+# Columns in AcademicYear.from_row order. The rows are unpacked straight from the
+# cursor, without building a dictionary per row.
+_ACADEMIC_YEAR_SELECT = "SELECT id, year_name, start_date, end_date FROM AcademicYears"
+_ACADEMIC_YEAR_BY_ID_QUERY = _ACADEMIC_YEAR_SELECT + " WHERE id = ?"
+_ACADEMIC_YEAR_BY_NAME_QUERY = _ACADEMIC_YEAR_SELECT + " WHERE year_name = ?"
+_ALL_ACADEMIC_YEARS_QUERY = _ACADEMIC_YEAR_SELECT + " ORDER BY year_name DESC"
+
 class AcademicYearService:
     """
     Manages business logic related to AcademicYear operations.
     Interacts with the DBManager to perform CRUD operations on AcademicYear data.
     """
-    def __init__(self):
+    def __init__(self, db_manager=None):
         """
         Initializes the AcademicYearService with a DBManager instance.
+
+        Args:
+            db_manager (DBManager, optional): The DBManager to use.
+                                              Defaults to the shared instance.
         """
-        self.db_manager = DBManager()
+        self.db_manager = db_manager or get_default_db_manager()
 
     def add_academic_year(self, year_name, start_date, end_date):
         """
@@ -30,8 +44,8 @@ class AcademicYearService:
             if new_id:
                 return AcademicYear(id=new_id, **ay_data)
             return None
-        except Exception as e:
-            print(f"Error adding academic year: {e}")
+        except Exception:
+            logger.exception("Error adding academic year")
             return None
 
     def get_academic_year_by_id(self, ay_id):
@@ -44,8 +58,8 @@ class AcademicYearService:
         Returns:
             AcademicYear or None: The AcademicYear object if found, None otherwise.
         """
-        data = self.db_manager.get_by_id('AcademicYears', ay_id)
-        return AcademicYear.from_dict(data) if data else None
+        row = self.db_manager.execute_query(_ACADEMIC_YEAR_BY_ID_QUERY, (ay_id,)).fetchone()
+        return AcademicYear.from_row(row) if row else None
 
     def get_academic_year_by_name(self, year_name):
         """
@@ -57,9 +71,8 @@ class AcademicYearService:
         Returns:
             AcademicYear or None: The AcademicYear object if found, None otherwise.
         """
-        query = "SELECT * FROM AcademicYears WHERE year_name = ?"
-        data = self.db_manager.fetch_one(query, (year_name,))
-        return AcademicYear.from_dict(data) if data else None
+        row = self.db_manager.execute_query(_ACADEMIC_YEAR_BY_NAME_QUERY, (year_name,)).fetchone()
+        return AcademicYear.from_row(row) if row else None
 
     def get_all_academic_years(self):
         """
@@ -68,8 +81,8 @@ class AcademicYearService:
         Returns:
             list[AcademicYear]: A list of AcademicYear objects.
         """
-        ays_data = self.db_manager.get_all('AcademicYears', order_by='year_name DESC')
-        return [AcademicYear.from_dict(data) for data in ays_data]
+        rows = self.db_manager.execute_query(_ALL_ACADEMIC_YEARS_QUERY).fetchall()
+        return [AcademicYear.from_row(row) for row in rows]
 
     def update_academic_year(self, ay_id, year_name=None, start_date=None, end_date=None):
         """
@@ -93,14 +106,14 @@ class AcademicYearService:
             update_data['end_date'] = end_date
 
         if not update_data:
-            print("No data provided for update.")
+            logger.warning("No data provided for update.")
             return False
 
         try:
             rows_affected = self.db_manager.update_one('AcademicYears', ay_id, update_data)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error updating academic year (ID: {ay_id}): {e}")
+        except Exception:
+            logger.exception("Error updating academic year (ID: %s)", ay_id)
             return False
 
     def delete_academic_year(self, ay_id):
@@ -118,8 +131,8 @@ class AcademicYearService:
         try:
             rows_affected = self.db_manager.delete_one('AcademicYears', ay_id)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error deleting academic year (ID: {ay_id}): {e}")
+        except Exception:
+            logger.exception("Error deleting academic year (ID: %s)", ay_id)
             return False
 
 # Example Usage (for testing purposes)
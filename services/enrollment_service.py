@@ -1,19 +1,86 @@
-from database.db_manager import DBManager
+import logging
+from database.db_manager import get_default_db_manager
+from services._query_cache import QueryCache
+from services._refcache import ReferenceCache
 from models.enrollment import Enrollment
 from models.student import Student
 from models.academic_year import AcademicYear
 from models.grade import Grade
 
+logger = logging.getLogger(__name__)
+
+# Tables read by the cached enrollment listings
+_ENROLLMENT_TABLES = ('Enrollments', 'Students', 'AcademicYears', 'Grades')
+
+# The enrollment listings are fixed SQL strings, so the connection's statement
+# cache can reuse their compiled form on every call
+_ENROLLMENT_SELECT = """
+    SELECT
+        e.id,
+        e.student_id,
+        s.name AS student_name,
+        s.student_id AS student_unique_id,
+        e.academic_year_id,
+        ay.year_name AS academic_year_name,
+        e.grade_id,
+        g.name AS grade_name
+    FROM Enrollments e
+    JOIN Students s ON e.student_id = s.id
+    JOIN AcademicYears ay ON e.academic_year_id = ay.id
+    JOIN Grades g ON e.grade_id = g.id
+"""
+
+_ENROLLMENTS_FOR_STUDENT_QUERY = _ENROLLMENT_SELECT + """
+    WHERE e.student_id = ?
+    ORDER BY ay.year_name DESC
+"""
+
+_ENROLLMENTS_BY_YEAR_AND_GRADE_QUERY = _ENROLLMENT_SELECT + """
+    WHERE e.academic_year_id = ? AND e.grade_id = ?
+    ORDER BY s.name
+"""
+
+_ALL_ENROLLMENTS_QUERY = _ENROLLMENT_SELECT + """
+    ORDER BY ay.year_name DESC, g.name, s.name
+"""
+
+# The full listing only joins Students; academic year and grade names come from
+# the ReferenceCache
+_ENROLLMENT_LIST_SELECT = """
+    SELECT
+        e.id,
+        e.student_id,
+        s.name AS student_name,
+        s.student_id AS student_unique_id,
+        e.academic_year_id,
+        e.grade_id
+    FROM Enrollments e
+    JOIN Students s ON e.student_id = s.id
+"""
+
+# Keyset page: ordered by id, so each page starts where the previous one ended
+_ENROLLMENTS_PAGE_QUERY = _ENROLLMENT_LIST_SELECT + """
+    WHERE e.id > ?
+    ORDER BY e.id
+    LIMIT ?
+"""
+
 class EnrollmentService:
     """
     Manages business logic related to Student Enrollment operations.
     Interacts with the DBManager to perform CRUD operations on Enrollment data.
     """
-    def __init__(self):
+    def __init__(self, db_manager=None):
         """
         Initializes the EnrollmentService with a DBManager instance.
+
+        Args:
+            db_manager (DBManager, optional): The DBManager to use.
+                                              Defaults to the shared instance.
         """
-        self.db_manager = DBManager()
+        self.db_manager = db_manager or get_default_db_manager()
+        self._query_cache = QueryCache(self.db_manager)
+        self._refs = ReferenceCache(self.db_manager)
 
     def add_enrollment(self, student_id, academic_year_id, grade_id):
         """
@@ -37,10 +104,34 @@ class EnrollmentService:
             if new_id:
                 return Enrollment(id=new_id, **enrollment_data)
             return None
-        except Exception as e:
-            print(f"Error adding enrollment: {e}")
+        except Exception:
+            logger.exception("Error adding enrollment")
             return None
 
+    def add_enrollments(self, enrollments):
+        """
+        Enrolls several students at once, e.g. a whole class at the start of a year,
+        committing all the enrollments in a single transaction.
+        Enrollments that fail (e.g. a student already enrolled that year) are skipped.
+
+        Args:
+            enrollments (list[tuple]): (student_id, academic_year_id, grade_id) tuples.
+
+        Returns:
+            list[Enrollment]: The created Enrollment objects.
+        """
+        added = []
+        try:
+            with self.db_manager.transaction():
+                for student_id, academic_year_id, grade_id in enrollments:
+                    enrollment = self.add_enrollment(student_id, academic_year_id, grade_id)
+                    if enrollment:
+                        added.append(enrollment)
+            return added
+        except Exception:
+            logger.exception("Error adding enrollments")
+            return []
+
     def get_enrollment_by_id(self, enrollment_id):
         """
         Retrieves an enrollment by its database ID.
@@ -65,24 +156,8 @@ class EnrollmentService:
             list[dict]: A list of dictionaries, each representing an enrollment
                         with student, academic year, and grade names included.
         """
-        query = """
-            SELECT
-                e.id,
-                e.student_id,
-                s.name AS student_name,
-                s.student_id AS student_unique_id,
-                e.academic_year_id,
-                ay.year_name AS academic_year_name,
-                e.grade_id,
-                g.name AS grade_name
-            FROM Enrollments e
-            JOIN Students s ON e.student_id = s.id
-            JOIN AcademicYears ay ON e.academic_year_id = ay.id
-            JOIN Grades g ON e.grade_id = g.id
-            WHERE e.student_id = ?
-            ORDER BY ay.year_name DESC
-        """
-        enrollments_data = self.db_manager.fetch_all(query, (student_id,))
+        enrollments_data = self._query_cache.fetch_all(
+            _ENROLLMENTS_FOR_STUDENT_QUERY, (student_id,), _ENROLLMENT_TABLES)
         return enrollments_data
 
     def get_enrollments_by_academic_year_and_grade(self, academic_year_id, grade_id):
@@ -97,53 +172,79 @@ class EnrollmentService:
             list[dict]: A list of dictionaries, each representing an enrollment
                         with student details.
         """
-        query = """
-            SELECT
-                e.id,
-                e.student_id,
-                s.name AS student_name,
-                s.student_id AS student_unique_id,
-                e.academic_year_id,
-                ay.year_name AS academic_year_name,
-                e.grade_id,
-                g.name AS grade_name
-            FROM Enrollments e
-            JOIN Students s ON e.student_id = s.id
-            JOIN AcademicYears ay ON e.academic_year_id = ay.id
-            JOIN Grades g ON e.grade_id = g.id
-            WHERE e.academic_year_id = ? AND e.grade_id = ?
-            ORDER BY s.name
-        """
-        enrollments_data = self.db_manager.fetch_all(query, (academic_year_id, grade_id))
+        enrollments_data = self._query_cache.fetch_all(
+            _ENROLLMENTS_BY_YEAR_AND_GRADE_QUERY, (academic_year_id, grade_id), _ENROLLMENT_TABLES)
         return enrollments_data
 
-    def get_all_enrollments(self):
+    def get_all_enrollments(self, limit=None, after_id=0, order=True):
         """
         Retrieves all enrollments from the database with related details.
+        With a limit, returns one page ordered by ID instead; pass the ID of the
+        last enrollment of a page as after_id to get the next one.
+
+        Args:
+            limit (int, optional): Maximum number of enrollments to return.
+                                   Defaults to None (all enrollments, ordered by year, grade, and name).
+            after_id (int, optional): Only return enrollments with a greater ID. Defaults to 0.
+            order (bool, optional): Sort the full list by name. Pass False when the caller
+                                    sorts the enrollments itself, to skip the sort. Defaults to True.
 
         Returns:
             list[dict]: A list of dictionaries, each representing an enrollment
                         with student, academic year, and grade names included.
         """
-        query = """
-            SELECT
-                e.id,
-                e.student_id,
-                s.name AS student_name,
-                s.student_id AS student_unique_id,
-                e.academic_year_id,
-                ay.year_name AS academic_year_name,
-                e.grade_id,
-                g.name AS grade_name
-            FROM Enrollments e
-            JOIN Students s ON e.student_id = s.id
-            JOIN AcademicYears ay ON e.academic_year_id = ay.id
-            JOIN Grades g ON e.grade_id = g.id
-            ORDER BY ay.year_name DESC, g.name, s.name
-        """
-        enrollments_data = self.db_manager.fetch_all(query)
+        if limit is None:
+            query, params = _ENROLLMENT_LIST_SELECT, ()
+        else:
+            query, params = _ENROLLMENTS_PAGE_QUERY, (after_id, limit)
+
+        def load():
+            enrollments = self._with_reference_names(self.db_manager.fetch_all(query, params))
+            if order and limit is None:
+                # Same order as _ALL_ENROLLMENTS_QUERY: latest year first, then grade and student name
+                enrollments.sort(key=lambda e: (e['grade_name'], e['student_name']))
+                enrollments.sort(key=lambda e: e['academic_year_name'], reverse=True)
+            return enrollments
+
+        enrollments_data = self._query_cache.get((query, params, order), _ENROLLMENT_TABLES, load)
         return enrollments_data
 
+    def _with_reference_names(self, rows):
+        """
+        Adds the academic year and grade names to enrollment rows from the ReferenceCache.
+        Like an inner JOIN, rows referring to a missing year or grade are dropped.
+        """
+        academic_years = self._refs.academic_years
+        grades = self._refs.grades
+        enrollments = []
+        for row in rows:
+            academic_year = academic_years.get(row['academic_year_id'])
+            grade = grades.get(row['grade_id'])
+            if academic_year is None or grade is None:
+                continue
+            enrollments.append({
+                'id': row['id'],
+                'student_id': row['student_id'],
+                'student_name': row['student_name'],
+                'student_unique_id': row['student_unique_id'],
+                'academic_year_id': row['academic_year_id'],
+                'academic_year_name': academic_year['year_name'],
+                'grade_id': row['grade_id'],
+                'grade_name': grade['name'],
+            })
+        return enrollments
+
+    def get_all_enrollments_columnar(self):
+        """
+        Retrieves all enrollments in columnar form, for export and analytics code
+        that scans whole columns. Display code should use get_all_enrollments().
+
+        Returns:
+            dict[str, list]: The values of each column (same columns as
+                             get_all_enrollments()), keyed by column name.
+        """
+        return self.db_manager.fetch_columns(_ALL_ENROLLMENTS_QUERY)
+
     def update_enrollment(self, enrollment_id, student_id=None, academic_year_id=None, grade_id=None):
         """
         Updates an existing enrollment's information.
@@ -166,14 +267,14 @@ class EnrollmentService:
             update_data['grade_id'] = grade_id
 
         if not update_data:
-            print("No data provided for update.")
+            logger.warning("No data provided for update.")
             return False
 
         try:
             rows_affected = self.db_manager.update_one('Enrollments', enrollment_id, update_data)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error updating enrollment (ID: {enrollment_id}): {e}")
+        except Exception:
+            logger.exception("Error updating enrollment (ID: %s)", enrollment_id)
             return False
 
     def delete_enrollment(self, enrollment_id):
@@ -189,14 +290,14 @@ class EnrollmentService:
         try:
             rows_affected = self.db_manager.delete_one('Enrollments', enrollment_id)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error deleting enrollment (ID: {enrollment_id}): {e}")
+        except Exception:
+            logger.exception("Error deleting enrollment (ID: %s)", enrollment_id)
             return False
 
 # Example Usage (for testing purposes)
 if __name__ == '__main__':
     enrollment_service = EnrollmentService()
-    db_manager = DBManager() # For fetching IDs for testing
+    db_manager = enrollment_service.db_manager # Same shared instance, for fetching IDs for testing
 
     # Ensure necessary data exists for testing enrollments
     grade1_id = db_manager.get_grade_by_name('Grade 1')['id'] if db_manager.get_grade_by_name('Grade 1') else db_manager.insert_one('Grades', {'name': 'Grade 1'})
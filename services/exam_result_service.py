@@ -1,19 +1,115 @@
-from database.db_manager import DBManager
+import logging
+from database.db_manager import get_default_db_manager
+from services._query_cache import QueryCache
+from services._refcache import ReferenceCache
 from models.exam_result import ExamResult
 from models.student import Student
 from models.exam import Exam
 from models.subject import Subject
 
+logger = logging.getLogger(__name__)
+
+# Columns of the UNIQUE constraint identifying an exam result
+_EXAM_RESULT_KEY = ('student_id', 'exam_id', 'subject_id')
+
+# Keeps IN (...) lists well under SQLite's bound-parameter limit
+_MAX_IDS_PER_QUERY = 500
+
+# The fixed queries are module constants so the connection's statement cache
+# can reuse their compiled form on every call
+_RESULT_BY_COMPOSITE_KEYS_QUERY = "SELECT * FROM ExamResults WHERE student_id = ? AND exam_id = ? AND subject_id = ?"
+
+_RESULTS_FOR_STUDENT_BY_EXAM_QUERY = """
+    SELECT
+        er.id,
+        er.student_id,
+        er.exam_id,
+        er.subject_id,
+        s.name AS subject_name,
+        er.marks
+    FROM ExamResults er
+    JOIN Subjects s ON er.subject_id = s.id
+    WHERE er.student_id = ? AND er.exam_id = ?
+    ORDER BY s.name
+"""
+
+_RESULTS_FOR_EXAM_BY_SUBJECT_QUERY = """
+    SELECT
+        er.id,
+        er.student_id,
+        st.name AS student_name,
+        st.student_id AS student_unique_id,
+        er.exam_id,
+        er.subject_id,
+        er.marks
+    FROM ExamResults er
+    JOIN Students st ON er.student_id = st.id
+    WHERE er.exam_id = ? AND er.subject_id = ?
+    ORDER BY st.name
+"""
+
+_EXAM_RESULT_SELECT = """
+    SELECT
+        er.id,
+        er.student_id,
+        st.name AS student_name,
+        st.student_id AS student_unique_id,
+        er.exam_id,
+        e.name AS exam_name,
+        e.max_marks AS exam_max_marks,
+        er.subject_id,
+        sub.name AS subject_name,
+        er.marks
+    FROM ExamResults er
+    JOIN Students st ON er.student_id = st.id
+    JOIN Exams e ON er.exam_id = e.id
+    JOIN Subjects sub ON er.subject_id = sub.id
+"""
+
+_ALL_EXAM_RESULTS_QUERY = _EXAM_RESULT_SELECT + """
+    ORDER BY st.name, e.name, sub.name
+"""
+
+# The full listing doesn't join Subjects; subject names come from the ReferenceCache
+_EXAM_RESULT_LIST_SELECT = """
+    SELECT
+        er.id,
+        er.student_id,
+        st.name AS student_name,
+        st.student_id AS student_unique_id,
+        er.exam_id,
+        e.name AS exam_name,
+        e.max_marks AS exam_max_marks,
+        er.subject_id,
+        er.marks
+    FROM ExamResults er
+    JOIN Students st ON er.student_id = st.id
+    JOIN Exams e ON er.exam_id = e.id
+"""
+
+# Keyset page: ordered by id, so each page starts where the previous one ended
+_EXAM_RESULTS_PAGE_QUERY = _EXAM_RESULT_LIST_SELECT + """
+    WHERE er.id > ?
+    ORDER BY er.id
+    LIMIT ?
+"""
+
 class ExamResultService:
     """
     Manages business logic related to individual ExamResult operations.
     Interacts with the DBManager to perform CRUD operations on ExamResult data.
     """
-    def __init__(self):
+    def __init__(self, db_manager=None):
         """
         Initializes the ExamResultService with a DBManager instance.
+
+        Args:
+            db_manager (DBManager, optional): The DBManager to use.
+                                              Defaults to the shared instance.
         """
-        self.db_manager = DBManager()
+        self.db_manager = db_manager or get_default_db_manager()
+        self._query_cache = QueryCache(self.db_manager)
+        self._refs = ReferenceCache(self.db_manager)
 
     def add_exam_result(self, student_id, exam_id, subject_id, marks):
         """
@@ -29,26 +125,92 @@ class ExamResultService:
             ExamResult or None: The created ExamResult object if successful, None otherwise.
         """
         try:
-            # Check if a result for this student, exam, and subject already exists
-            existing_result = self.get_exam_result_by_composite_keys(student_id, exam_id, subject_id)
-            if existing_result:
-                print(f"Result for student {student_id}, exam {exam_id}, subject {subject_id} already exists. Use update_exam_result instead.")
+            exam_result_data = {
+                'student_id': student_id,
+                'exam_id': exam_id,
+                'subject_id': subject_id,
+                'marks': marks
+            }
+            new_id = self.db_manager.insert_one('ExamResults', exam_result_data, ignore_duplicates=True)
+            if new_id is None:
+                # Skipped by the UNIQUE(student_id, exam_id, subject_id) constraint
+                logger.info("Result for student %s, exam %s, subject %s already exists. Use update_exam_result instead.",
+                            student_id, exam_id, subject_id)
                 return None
+            return ExamResult(id=new_id, **exam_result_data)
+        except Exception:
+            logger.exception("Error adding exam result")
+            return None
+
+    def add_exam_results(self, results):
+        """
+        Adds many exam results at once, e.g. a whole class's marks for an exam.
+        Results that already exist for the same student, exam, and subject are skipped.
+
+        Args:
+            results (list[tuple]): (student_id, exam_id, subject_id, marks) tuples.
+
+        Returns:
+            int: The number of exam results added.
+        """
+        rows = [
+            {'student_id': student_id, 'exam_id': exam_id, 'subject_id': subject_id, 'marks': marks}
+            for student_id, exam_id, subject_id, marks in results
+        ]
+        try:
+            return self.db_manager.insert_many('ExamResults', rows, ignore_duplicates=True)
+        except Exception:
+            logger.exception("Error adding exam results")
+            return 0
+
+    def upsert_exam_result(self, student_id, exam_id, subject_id, marks):
+        """
+        Records a student's marks in a subject and exam, adding the result or
+        overwriting the marks of the existing one in a single statement.
+
+        Args:
+            student_id (int): The ID of the student.
+            exam_id (int): The ID of the exam.
+            subject_id (int): The ID of the subject.
+            marks (float): The marks obtained by the student.
 
+        Returns:
+            ExamResult or None: The stored ExamResult object if successful, None otherwise.
+        """
+        try:
             exam_result_data = {
                 'student_id': student_id,
                 'exam_id': exam_id,
                 'subject_id': subject_id,
                 'marks': marks
             }
-            new_id = self.db_manager.insert_one('ExamResults', exam_result_data)
-            if new_id:
-                return ExamResult(id=new_id, **exam_result_data)
-            return None
-        except Exception as e:
-            print(f"Error adding exam result: {e}")
+            result_id = self.db_manager.upsert_one('ExamResults', exam_result_data, _EXAM_RESULT_KEY)
+            return ExamResult(id=result_id, **exam_result_data)
+        except Exception:
+            logger.exception("Error saving exam result")
             return None
 
+    def upsert_exam_results(self, results):
+        """
+        Records many marks at once, e.g. a whole grade-entry sheet, adding new
+        results and overwriting the marks of existing ones in one transaction.
+
+        Args:
+            results (list[tuple]): (student_id, exam_id, subject_id, marks) tuples.
+
+        Returns:
+            int: The number of exam results added or updated.
+        """
+        rows = [
+            {'student_id': student_id, 'exam_id': exam_id, 'subject_id': subject_id, 'marks': marks}
+            for student_id, exam_id, subject_id, marks in results
+        ]
+        try:
+            return self.db_manager.upsert_many('ExamResults', rows, _EXAM_RESULT_KEY)
+        except Exception:
+            logger.exception("Error saving exam results")
+            return 0
+
     def get_exam_result_by_id(self, result_id):
         """
         Retrieves an exam result by its database ID.
@@ -74,8 +236,7 @@ class ExamResultService:
         Returns:
             ExamResult or None: The ExamResult object if found, None otherwise.
         """
-        query = "SELECT * FROM ExamResults WHERE student_id = ? AND exam_id = ? AND subject_id = ?"
-        data = self.db_manager.fetch_one(query, (student_id, exam_id, subject_id))
+        data = self.db_manager.fetch_one(_RESULT_BY_COMPOSITE_KEYS_QUERY, (student_id, exam_id, subject_id))
         return ExamResult.from_dict(data) if data else None
 
     def get_results_for_student_by_exam(self, student_id, exam_id):
@@ -90,22 +251,47 @@ class ExamResultService:
             list[dict]: A list of dictionaries, each representing an exam result
                         with subject name included.
         """
-        query = """
-            SELECT
-                er.id,
-                er.student_id,
-                er.exam_id,
-                er.subject_id,
-                s.name AS subject_name,
-                er.marks
-            FROM ExamResults er
-            JOIN Subjects s ON er.subject_id = s.id
-            WHERE er.student_id = ? AND er.exam_id = ?
-            ORDER BY s.name
-        """
-        results_data = self.db_manager.fetch_all(query, (student_id, exam_id))
+        results_data = self._query_cache.fetch_all(
+            _RESULTS_FOR_STUDENT_BY_EXAM_QUERY, (student_id, exam_id), ('ExamResults', 'Subjects'))
         return results_data
 
+    def get_results_for_students_by_exam(self, student_ids, exam_id):
+        """
+        Retrieves the exam results of several students in a given exam
+        with one query per batch of students, instead of one query per student.
+
+        Args:
+            student_ids (list[int]): The IDs of the students.
+            exam_id (int): The ID of the exam.
+
+        Returns:
+            dict[int, list[dict]]: The results of each student (with subject and
+                                   student names included), keyed by student ID.
+        """
+        results_by_student = {student_id: [] for student_id in student_ids}
+        student_ids = list(results_by_student)
+        for start in range(0, len(student_ids), _MAX_IDS_PER_QUERY):
+            batch = student_ids[start:start + _MAX_IDS_PER_QUERY]
+            placeholders = ', '.join(['?' for _ in batch])
+            query = f"""
+                SELECT
+                    er.id,
+                    er.student_id,
+                    st.name AS student_name,
+                    er.exam_id,
+                    er.subject_id,
+                    s.name AS subject_name,
+                    er.marks
+                FROM ExamResults er
+                JOIN Subjects s ON er.subject_id = s.id
+                JOIN Students st ON er.student_id = st.id
+                WHERE er.exam_id = ? AND er.student_id IN ({placeholders})
+                ORDER BY st.name, s.name
+            """
+            for row in self.db_manager.fetch_all(query, (exam_id, *batch)):
+                results_by_student[row['student_id']].append(row)
+        return results_by_student
+
     def get_results_for_exam_by_subject(self, exam_id, subject_id):
         """
         Retrieves all exam results for a specific subject in a given exam.
@@ -118,51 +304,93 @@ class ExamResultService:
             list[dict]: A list of dictionaries, each representing an exam result
                         with student name included.
         """
-        query = """
-            SELECT
-                er.id,
-                er.student_id,
-                st.name AS student_name,
-                st.student_id AS student_unique_id,
-                er.exam_id,
-                er.subject_id,
-                er.marks
-            FROM ExamResults er
-            JOIN Students st ON er.student_id = st.id
-            WHERE er.exam_id = ? AND er.subject_id = ?
-            ORDER BY st.name
-        """
-        results_data = self.db_manager.fetch_all(query, (exam_id, subject_id))
+        results_data = self._query_cache.fetch_all(
+            _RESULTS_FOR_EXAM_BY_SUBJECT_QUERY, (exam_id, subject_id), ('ExamResults', 'Students'))
         return results_data
 
-    def get_all_exam_results(self):
+    def get_all_exam_results(self, limit=None, after_id=0, order=True):
         """
         Retrieves all exam results from the database with related student, exam, and subject names.
+        With a limit, returns one page ordered by ID instead; pass the ID of the
+        last result of a page as after_id to get the next one.
+
+        Args:
+            limit (int, optional): Maximum number of results to return.
+                                   Defaults to None (all results, ordered by name).
+            after_id (int, optional): Only return results with a greater ID. Defaults to 0.
+            order (bool, optional): Sort the full list by name. Pass False when the caller
+                                    sorts the results itself, to skip the sort. Defaults to True.
 
         Returns:
             list[dict]: A list of dictionaries, each representing an exam result.
         """
-        query = """
-            SELECT
-                er.id,
-                er.student_id,
-                st.name AS student_name,
-                st.student_id AS student_unique_id,
-                er.exam_id,
-                e.name AS exam_name,
-                e.max_marks AS exam_max_marks,
-                er.subject_id,
-                sub.name AS subject_name,
-                er.marks
-            FROM ExamResults er
-            JOIN Students st ON er.student_id = st.id
-            JOIN Exams e ON er.exam_id = e.id
-            JOIN Subjects sub ON er.subject_id = sub.id
-            ORDER BY st.name, e.name, sub.name
-        """
-        results_data = self.db_manager.fetch_all(query)
+        if limit is None:
+            query, params = _EXAM_RESULT_LIST_SELECT, ()
+        else:
+            query, params = _EXAM_RESULTS_PAGE_QUERY, (after_id, limit)
+
+        def load():
+            results = self._with_subject_names(self.db_manager.fetch_all(query, params))
+            if order and limit is None:
+                # Same order as _ALL_EXAM_RESULTS_QUERY
+                results.sort(key=lambda r: (r['student_name'], r['exam_name'], r['subject_name']))
+            return results
+
+        results_data = self._query_cache.get(
+            (query, params, order), ('ExamResults', 'Students', 'Exams', 'Subjects'), load)
         return results_data
 
+    def _with_subject_names(self, rows):
+        """
+        Adds the subject names to exam result rows from the ReferenceCache.
+        Like an inner JOIN, rows referring to a missing subject are dropped.
+        """
+        subjects = self._refs.subjects
+        results = []
+        for row in rows:
+            subject = subjects.get(row['subject_id'])
+            if subject is None:
+                continue
+            marks = row.pop('marks')
+            row['subject_name'] = subject['name']
+            row['marks'] = marks # Keep the column order of _ALL_EXAM_RESULTS_QUERY
+            results.append(row)
+        return results
+
+    def get_all_exam_results_columnar(self):
+        """
+        Retrieves all exam results in columnar form, for export and analytics code
+        that scans whole columns. Display code should use get_all_exam_results().
+
+        Returns:
+            dict[str, list]: The values of each column (same columns as
+                             get_all_exam_results()), keyed by column name.
+        """
+        return self.db_manager.fetch_columns(_ALL_EXAM_RESULTS_QUERY)
+
+    def get_all_exam_results_df(self):
+        """
+        Retrieves all exam results as a pandas DataFrame, for reports that aggregate
+        marks (averages, percentages, pass/fail) with vectorized operations, e.g.
+        df.groupby(['student_id', 'exam_id'])['marks'].mean().
+        Requires pandas, which is only needed for these analytics paths.
+
+        Returns:
+            pandas.DataFrame: One row per exam result, with the same columns as
+                              get_all_exam_results(). IDs are int32; marks keep
+                              SQLite's REAL (float64) precision, so aggregates match
+                              the stored result totals.
+        """
+        import pandas as pd # Optional dependency; the GUI only uses the list[dict] methods
+
+        df = pd.read_sql_query(_ALL_EXAM_RESULTS_QUERY, self.db_manager.get_connection())
+        return df.astype({
+            'id': 'int32',
+            'student_id': 'int32',
+            'exam_id': 'int32',
+            'subject_id': 'int32',
+        })
+
     def update_exam_result(self, result_id, marks=None):
         """
         Updates an existing exam result's marks.
@@ -179,14 +407,14 @@ class ExamResultService:
             update_data['marks'] = marks
 
         if not update_data:
-            print("No data provided for update.")
+            logger.warning("No data provided for update.")
             return False
 
         try:
             rows_affected = self.db_manager.update_one('ExamResults', result_id, update_data)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error updating exam result (ID: {result_id}): {e}")
+        except Exception:
+            logger.exception("Error updating exam result (ID: %s)", result_id)
             return False
 
     def delete_exam_result(self, result_id):
@@ -202,14 +430,14 @@ class ExamResultService:
         try:
             rows_affected = self.db_manager.delete_one('ExamResults', result_id)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error deleting exam result (ID: {result_id}): {e}")
+        except Exception:
+            logger.exception("Error deleting exam result (ID: %s)", result_id)
             return False
 
 # Example Usage (for testing purposes)
 if __name__ == '__main__':
     exam_result_service = ExamResultService()
-    db_manager = DBManager() # For fetching IDs for testing
+    db_manager = exam_result_service.db_manager # Same shared instance, for fetching IDs for testing
 
     # Ensure necessary data exists for testing exam results
     # Students
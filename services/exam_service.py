@@ -1,18 +1,78 @@
-from database.db_manager import DBManager
+import logging
+from database.db_manager import get_default_db_manager
+from services._query_cache import QueryCache
 from models.exam import Exam
 from models.semester import Semester
 from models.academic_year import AcademicYear
 
+logger = logging.getLogger(__name__)
+
+# Keeps IN (...) lists well under SQLite's bound-parameter limit
+_MAX_IDS_PER_QUERY = 500
+
+# The fixed queries are module constants so the connection's statement cache
+# can reuse their compiled form on every call
+
+# A NULL semester_id (yearly exam) compares as -1 on both sides, matching the
+# ux_exam_period index, so one statement serves both kinds of exam
+_EXAM_BY_NAME_AND_PERIOD_QUERY = """
+    SELECT * FROM Exams
+    WHERE name = ? AND academic_year_id = ? AND COALESCE(semester_id, -1) = COALESCE(?, -1)
+    LIMIT 1
+"""
+
+_EXAM_SELECT = """
+    SELECT
+        e.id,
+        e.name,
+        e.max_marks,
+        e.semester_id,
+        s.name AS semester_name,
+        e.academic_year_id,
+        ay.year_name AS academic_year_name
+    FROM Exams e
+    JOIN AcademicYears ay ON e.academic_year_id = ay.id
+    LEFT JOIN Semesters s ON e.semester_id = s.id
+"""
+
+_EXAM_BY_ID_EAGER_QUERY = _EXAM_SELECT + """
+    WHERE e.id = ?
+"""
+
+# Serves get_all_exams, get_exams_by_academic_year, and get_exams_by_semester;
+# a NULL filter parameter matches every exam
+_EXAMS_QUERY = _EXAM_SELECT + """
+    WHERE (:academic_year_id IS NULL OR e.academic_year_id = :academic_year_id)
+      AND (:semester_id IS NULL OR e.semester_id = :semester_id)
+    ORDER BY ay.year_name DESC, s.name, e.name
+"""
+
+# Columns in Exam.from_row order, sorted like _EXAMS_QUERY
+_ALL_EXAM_OBJECTS_QUERY = """
+    SELECT e.id, e.name, e.semester_id, e.academic_year_id, e.max_marks
+    FROM Exams e
+    JOIN AcademicYears ay ON e.academic_year_id = ay.id
+    LEFT JOIN Semesters s ON e.semester_id = s.id
+    ORDER BY ay.year_name DESC, s.name, e.name
+"""
+
 class ExamService:
     """
     Manages business logic related to Exam operations (including CATs).
     Interacts with the DBManager to perform CRUD operations on Exam data.
     """
-    def __init__(self):
+    def __init__(self, db_manager=None):
         """
         Initializes the ExamService with a DBManager instance.
+
+        Args:
+            db_manager (DBManager, optional): The DBManager to use.
+                                              Defaults to the shared instance.
         """
-        self.db_manager = DBManager()
+        self.db_manager = db_manager or get_default_db_manager()
+        # Exam metadata rarely changes during a grading session; single-exam lookups
+        # are kept until the Exams table is written
+        self._lookup_cache = QueryCache(self.db_manager, maxsize=512)
 
     def add_exam(self, name, academic_year_id, semester_id=None, max_marks=100):
         """
@@ -35,14 +95,40 @@ class ExamService:
                 'academic_year_id': academic_year_id,
                 'max_marks': max_marks
             }
-            new_id = self.db_manager.insert_one('Exams', exam_data)
-            if new_id:
-                return Exam(id=new_id, **exam_data)
-            return None
-        except Exception as e:
-            print(f"Error adding exam: {e}")
+            row = self.db_manager.insert_returning('Exams', exam_data)
+            return Exam.from_dict(row)
+        except Exception:
+            logger.exception("Error adding exam")
             return None
 
+    def add_exams(self, exams):
+        """
+        Adds several exams at once, e.g. the exams and CATs of a new term,
+        with a single executemany() call in one transaction.
+        Exams that already exist for the same semester and academic year are skipped.
+
+        Args:
+            exams (list[dict]): Dictionaries with 'name' and 'academic_year_id' keys and,
+                                optionally, 'semester_id' and 'max_marks' (as for add_exam).
+
+        Returns:
+            int: The number of exams added.
+        """
+        rows = [
+            {
+                'name': exam['name'],
+                'semester_id': exam.get('semester_id'),
+                'academic_year_id': exam['academic_year_id'],
+                'max_marks': exam.get('max_marks', 100)
+            }
+            for exam in exams
+        ]
+        try:
+            return self.db_manager.insert_many('Exams', rows, ignore_duplicates=True)
+        except Exception:
+            logger.exception("Error adding exams")
+            return 0
+
     def get_exam_by_id(self, exam_id):
         """
         Retrieves an exam by its database ID.
@@ -53,8 +139,44 @@ class ExamService:
         Returns:
             Exam or None: The Exam object if found, None otherwise.
         """
-        data = self.db_manager.get_by_id('Exams', exam_id)
-        return Exam.from_dict(data) if data else None
+        def load():
+            data = self.db_manager.get_by_id('Exams', exam_id)
+            return Exam.from_dict(data) if data else None
+        return self._lookup_cache.get(('id', exam_id), ('Exams',), load)
+
+    def get_exam_by_id_eager(self, exam_id):
+        """
+        Retrieves an exam by its database ID together with its semester and
+        academic year names, in one query instead of three.
+
+        Args:
+            exam_id (int): The database ID of the exam.
+
+        Returns:
+            dict or None: The exam as a dictionary (as in get_all_exams()) if found, None otherwise.
+        """
+        return self.db_manager.fetch_one(_EXAM_BY_ID_EAGER_QUERY, (exam_id,))
+
+    def get_exams_by_ids(self, exam_ids):
+        """
+        Retrieves several exams by their database IDs with one query per batch
+        of IDs, instead of one get_exam_by_id() call per exam.
+
+        Args:
+            exam_ids (list[int]): The database IDs of the exams.
+
+        Returns:
+            dict[int, Exam]: The Exam objects found, keyed by ID.
+        """
+        exam_ids = list(dict.fromkeys(exam_ids)) # Drop duplicates, keep order
+        exams = {}
+        for start in range(0, len(exam_ids), _MAX_IDS_PER_QUERY):
+            batch = exam_ids[start:start + _MAX_IDS_PER_QUERY]
+            placeholders = ', '.join(['?' for _ in batch])
+            query = f"SELECT id, name, semester_id, academic_year_id, max_marks FROM Exams WHERE id IN ({placeholders})"
+            for row in self.db_manager.execute_query(query, tuple(batch)).fetchall():
+                exams[row[0]] = Exam.from_row(row)
+        return exams
 
     def get_exam_by_name_and_period(self, name, academic_year_id, semester_id=None):
         """
@@ -68,16 +190,10 @@ class ExamService:
         Returns:
             Exam or None: The Exam object if found, None otherwise.
         """
-        query = "SELECT * FROM Exams WHERE name = ? AND academic_year_id = ?"
-        params = [name, academic_year_id]
-        if semester_id is not None:
-            query += " AND semester_id = ?"
-            params.append(semester_id)
-        else:
-            query += " AND semester_id IS NULL" # For yearly exams not tied to semester
-
-        data = self.db_manager.fetch_one(query, tuple(params))
-        return Exam.from_dict(data) if data else None
+        def load():
+            data = self.db_manager.fetch_one(_EXAM_BY_NAME_AND_PERIOD_QUERY, (name, academic_year_id, semester_id))
+            return Exam.from_dict(data) if data else None
+        return self._lookup_cache.get(('period', name, academic_year_id, semester_id), ('Exams',), load)
 
     def get_exams_by_academic_year(self, academic_year_id):
         """
@@ -90,22 +206,7 @@ class ExamService:
             list[dict]: A list of dictionaries, each representing an exam
                         with related semester and academic year names.
         """
-        query = """
-            SELECT
-                e.id,
-                e.name,
-                e.max_marks,
-                e.semester_id,
-                s.name AS semester_name,
-                e.academic_year_id,
-                ay.year_name AS academic_year_name
-            FROM Exams e
-            JOIN AcademicYears ay ON e.academic_year_id = ay.id
-            LEFT JOIN Semesters s ON e.semester_id = s.id
-            WHERE e.academic_year_id = ?
-            ORDER BY ay.year_name DESC, s.name, e.name
-        """
-        exams_data = self.db_manager.fetch_all(query, (academic_year_id,))
+        exams_data = self._list_exams(academic_year_id=academic_year_id)
         return exams_data
 
     def get_exams_by_semester(self, semester_id, academic_year_id):
@@ -119,25 +220,9 @@ class ExamService:
         Returns:
             list[dict]: A list of dictionaries, each representing an exam.
         """
-        query = """
-            SELECT
-                e.id,
-                e.name,
-                e.max_marks,
-                e.semester_id,
-                s.name AS semester_name,
-                e.academic_year_id,
-                ay.year_name AS academic_year_name
-            FROM Exams e
-            JOIN AcademicYears ay ON e.academic_year_id = ay.id
-            JOIN Semesters s ON e.semester_id = s.id
-            WHERE e.semester_id = ? AND e.academic_year_id = ?
-            ORDER BY e.name
-        """
-        exams_data = self.db_manager.fetch_all(query, (semester_id, academic_year_id))
+        exams_data = self._list_exams(academic_year_id=academic_year_id, semester_id=semester_id)
         return exams_data
 
-
     def get_all_exams(self):
         """
         Retrieves all exams from the database with related semester and academic year names.
@@ -145,22 +230,40 @@ class ExamService:
         Returns:
             list[dict]: A list of dictionaries, each representing an exam.
         """
-        query = """
-            SELECT
-                e.id,
-                e.name,
-                e.max_marks,
-                e.semester_id,
-                s.name AS semester_name,
-                e.academic_year_id,
-                ay.year_name AS academic_year_name
-            FROM Exams e
-            JOIN AcademicYears ay ON e.academic_year_id = ay.id
-            LEFT JOIN Semesters s ON e.semester_id = s.id
-            ORDER BY ay.year_name DESC, s.name, e.name
+        return self._list_exams()
+
+    def _list_exams(self, academic_year_id=None, semester_id=None):
         """
-        exams_data = self.db_manager.fetch_all(query)
-        return exams_data
+        Runs _EXAMS_QUERY, filtered by academic year and/or semester when given.
+        """
+        params = {'academic_year_id': academic_year_id, 'semester_id': semester_id}
+        return self.db_manager.fetch_all(_EXAMS_QUERY, params)
+
+    def iter_all_exams(self, chunk_size=1000):
+        """
+        Streams all exams with related semester and academic year names, reading
+        chunk_size rows from the database at a time. Suited to large reports and
+        exports that process exams one by one.
+
+        Args:
+            chunk_size (int, optional): Number of rows fetched per round. Defaults to 1000.
+
+        Yields:
+            dict: A dictionary representing an exam, as in get_all_exams().
+        """
+        yield from self.db_manager.iter_all(
+            _EXAMS_QUERY, {'academic_year_id': None, 'semester_id': None}, chunk_size=chunk_size)
+
+    def get_all_exam_objects(self):
+        """
+        Retrieves all exams as Exam objects, in the same order as get_all_exams(),
+        building each object straight from its database row.
+
+        Returns:
+            list[Exam]: A list of Exam objects.
+        """
+        rows = self.db_manager.execute_query(_ALL_EXAM_OBJECTS_QUERY).fetchall()
+        return [Exam.from_row(row) for row in rows]
 
     def update_exam(self, exam_id, name=None, semester_id=None, academic_year_id=None, max_marks=None):
         """
@@ -187,14 +290,22 @@ class ExamService:
             update_data['max_marks'] = max_marks
 
         if not update_data:
-            print("No data provided for update.")
+            logger.warning("No data provided for update.")
             return False
 
+        # Skip the write when the exam already has these values (e.g. "Save" without edits)
+        current = self.get_exam_by_id(exam_id)
+        if current is None:
+            return False
+        update_data = {k: v for k, v in update_data.items() if getattr(current, k) != v}
+        if not update_data:
+            return True
+
         try:
             rows_affected = self.db_manager.update_one('Exams', exam_id, update_data)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error updating exam (ID: {exam_id}): {e}")
+        except Exception:
+            logger.exception("Error updating exam (ID: %s)", exam_id)
             return False
 
     def delete_exam(self, exam_id):
@@ -212,14 +323,14 @@ class ExamService:
         try:
             rows_affected = self.db_manager.delete_one('Exams', exam_id)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error deleting exam (ID: {exam_id}): {e}")
+        except Exception:
+            logger.exception("Error deleting exam (ID: %s)", exam_id)
             return False
 
 # Example Usage (for testing purposes)
 if __name__ == '__main__':
     exam_service = ExamService()
-    db_manager = DBManager() # For fetching IDs for testing
+    db_manager = exam_service.db_manager # Same shared instance, for fetching IDs for testing
 
     # Ensure necessary data exists for testing exams
     ay_2023_2024_id = db_manager.get_academic_year_by_name('2023/2024')['id'] if db_manager.get_academic_year_by_name('2023/2024') else db_manager.insert_one('AcademicYears', {'year_name': '2023/2024', 'start_date': '2023-09-01', 'end_date': '2024-07-31'})
@@ -230,33 +341,16 @@ if __name__ == '__main__':
     print("\n--- Testing ExamService ---")
 
     # Add exams
-    print("Adding Semester 1 Exam for 2023/2024...")
-    exam_s1_23 = exam_service.add_exam("Semester 1 Exam", ay_2023_2024_id, sem1_id, 100)
-    if exam_s1_23:
-        print(f"Added: {exam_s1_23}")
-    else:
-        print("Failed to add Semester 1 Exam (might already exist).")
-
-    print("Adding CAT 1 for Semester 1, 2023/2024...")
-    cat1_s1_23 = exam_service.add_exam("CAT 1", ay_2023_2024_id, sem1_id, 30)
-    if cat1_s1_23:
-        print(f"Added: {cat1_s1_23}")
-    else:
-        print("Failed to add CAT 1 (might already exist).")
-
-    print("Adding Semester 2 Exam for 2023/2024...")
-    exam_s2_23 = exam_service.add_exam("Semester 2 Exam", ay_2023_2024_id, sem2_id, 100)
-    if exam_s2_23:
-        print(f"Added: {exam_s2_23}")
-    else:
-        print("Failed to add Semester 2 Exam (might already exist).")
-
-    print("Adding Yearly Final Exam for 2023/2024 (no semester)...")
-    yearly_exam_23 = exam_service.add_exam("Yearly Final Exam", ay_2023_2024_id, None, 200)
-    if yearly_exam_23:
-        print(f"Added: {yearly_exam_23}")
-    else:
-        print("Failed to add Yearly Final Exam (might already exist).")
+    print("Adding the 2023/2024 exams (Semester 1 Exam, CAT 1, Semester 2 Exam, Yearly Final Exam)...")
+    added = exam_service.add_exams([
+        {'name': "Semester 1 Exam", 'academic_year_id': ay_2023_2024_id, 'semester_id': sem1_id, 'max_marks': 100},
+        {'name': "CAT 1", 'academic_year_id': ay_2023_2024_id, 'semester_id': sem1_id, 'max_marks': 30},
+        {'name': "Semester 2 Exam", 'academic_year_id': ay_2023_2024_id, 'semester_id': sem2_id, 'max_marks': 100},
+        {'name': "Yearly Final Exam", 'academic_year_id': ay_2023_2024_id, 'max_marks': 200}, # No semester
+    ])
+    print(f"Added {added} exam(s) (existing ones are skipped).")
+    cat1_s1_23 = exam_service.get_exam_by_name_and_period("CAT 1", ay_2023_2024_id, sem1_id)
+    yearly_exam_23 = exam_service.get_exam_by_name_and_period("Yearly Final Exam", ay_2023_2024_id)
 
     # Get all exams
     print("\nAll Exams:")
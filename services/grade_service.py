@@ -1,16 +1,30 @@
-from database.db_manager import DBManager
+import logging
+from database.db_manager import get_default_db_manager
+from services._refcache import ModelCache
 from models.grade import Grade
 
+logger = logging.getLogger(__name__)
+
+# Columns in Grade.from_row order
+_ALL_GRADES_QUERY = "SELECT id, name, description FROM Grades ORDER BY name"
+
 class GradeService:
     """
     Manages business logic related to Grade operations.
     Interacts with the DBManager to perform CRUD operations on Grade data.
     """
-    def __init__(self):
+    # Grades rarely change, so lookups are served from memory (shared by all instances)
+    _cache = ModelCache('Grades', _ALL_GRADES_QUERY, Grade)
+
+    def __init__(self, db_manager=None):
         """
         Initializes the GradeService with a DBManager instance.
+
+        Args:
+            db_manager (DBManager, optional): The DBManager to use.
+                                              Defaults to the shared instance.
         """
-        self.db_manager = DBManager()
+        self.db_manager = db_manager or get_default_db_manager()
 
     def add_grade(self, name, description=None):
         """
@@ -25,14 +39,30 @@ class GradeService:
         """
         try:
             grade_data = {'name': name, 'description': description}
-            new_id = self.db_manager.insert_one('Grades', grade_data)
-            if new_id:
-                return Grade(id=new_id, **grade_data)
-            return None
-        except Exception as e:
-            print(f"Error adding grade: {e}")
+            row = self.db_manager.insert_returning('Grades', grade_data)
+            return Grade.from_dict(row)
+        except Exception:
+            logger.exception("Error adding grade")
             return None
 
+    def add_grades(self, grades):
+        """
+        Adds several grades at once with a single executemany() call in one transaction.
+        Grades whose name already exists are skipped.
+
+        Args:
+            grades (list[dict]): Dictionaries with a 'name' key and, optionally, a 'description'.
+
+        Returns:
+            int: The number of grades added.
+        """
+        rows = [{'name': grade['name'], 'description': grade.get('description')} for grade in grades]
+        try:
+            return self.db_manager.insert_many('Grades', rows, ignore_duplicates=True)
+        except Exception:
+            logger.exception("Error adding grades")
+            return 0
+
     def get_grade_by_id(self, grade_id):
         """
         Retrieves a grade by its database ID.
@@ -43,8 +73,7 @@ class GradeService:
         Returns:
             Grade or None: The Grade object if found, None otherwise.
         """
-        data = self.db_manager.get_by_id('Grades', grade_id)
-        return Grade.from_dict(data) if data else None
+        return self._cache.get_by_id(self.db_manager, grade_id)
 
     def get_grade_by_name(self, name):
         """
@@ -56,9 +85,7 @@ class GradeService:
         Returns:
             Grade or None: The Grade object if found, None otherwise.
         """
-        query = "SELECT * FROM Grades WHERE name = ?"
-        data = self.db_manager.fetch_one(query, (name,))
-        return Grade.from_dict(data) if data else None
+        return self._cache.get_by_name(self.db_manager, name)
 
     def get_all_grades(self):
         """
@@ -67,8 +94,23 @@ class GradeService:
         Returns:
             list[Grade]: A list of Grade objects.
         """
-        grades_data = self.db_manager.get_all('Grades', order_by='name')
-        return [Grade.from_dict(data) for data in grades_data]
+        return self._cache.get_all(self.db_manager)
+
+    def get_grade_names(self):
+        """
+        Retrieves the name of every grade keyed by its ID.
+
+        Returns:
+            Mapping[int, str]: Grade names keyed by grade ID (read-only).
+        """
+        return self._cache.names(self.db_manager)
+
+    def clear_cache(self):
+        """
+        Forces the next lookup to reload the grades, e.g. after the database
+        was changed outside this application.
+        """
+        self._cache.clear()
 
     def update_grade(self, grade_id, name=None, description=None):
         """
@@ -89,14 +131,22 @@ class GradeService:
             update_data['description'] = description
 
         if not update_data:
-            print("No data provided for update.")
+            logger.warning("No data provided for update.")
             return False
 
+        # Skip the write when the grade already has these values (e.g. "Save" without edits)
+        current = self.get_grade_by_id(grade_id)
+        if current is None:
+            return False
+        update_data = {k: v for k, v in update_data.items() if getattr(current, k) != v}
+        if not update_data:
+            return True
+
         try:
             rows_affected = self.db_manager.update_one('Grades', grade_id, update_data)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error updating grade (ID: {grade_id}): {e}")
+        except Exception:
+            logger.exception("Error updating grade (ID: %s)", grade_id)
             return False
 
     def delete_grade(self, grade_id):
@@ -114,8 +164,8 @@ class GradeService:
         try:
             rows_affected = self.db_manager.delete_one('Grades', grade_id)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error deleting grade (ID: {grade_id}): {e}")
+        except Exception:
+            logger.exception("Error deleting grade (ID: %s)", grade_id)
             return False
 
 # Example Usage (for testing purposes)
@@ -125,19 +175,13 @@ if __name__ == '__main__':
     print("\n--- Testing GradeService ---")
 
     # Add grades
-    print("Adding Grade 1...")
-    grade1 = grade_service.add_grade("Grade 1", "First year of primary school")
-    if grade1:
-        print(f"Added: {grade1}")
-    else:
-        print("Failed to add Grade 1 (might already exist).")
-
-    print("Adding Grade 8...")
-    grade8 = grade_service.add_grade("Grade 8", "Final year of primary school")
-    if grade8:
-        print(f"Added: {grade8}")
-    else:
-        print("Failed to add Grade 8 (might already exist).")
+    print("Adding Grade 1 and Grade 8...")
+    added = grade_service.add_grades([
+        {'name': "Grade 1", 'description': "First year of primary school"},
+        {'name': "Grade 8", 'description': "Final year of primary school"},
+    ])
+    print(f"Added {added} grade(s) (existing ones are skipped).")
+    grade1 = grade_service.get_grade_by_name("Grade 1")
 
     # Get all grades
     print("\nAll Grades:")
@@ -177,6 +221,4 @@ if __name__ == '__main__':
     for g in all_grades_after:
         print(g)
 
-    # Note: DBManager connection is managed internally by each service instance.
-    # For a full application, you might manage a single connection more centrally
-    # or ensure all services close their connections properly.
+    # Note: the DBManager connection is shared by all services (see get_default_db_manager).
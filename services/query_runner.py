@@ -0,0 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared by all services; jobs run on worker threads, each with its own connection
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='query')
+
+def submit(fn, *args):
+    """
+    Runs fn(*args) on the shared query pool. Only for work that is independent of
+    the caller's thread: a worker has its own connection, so it can't see writes
+    the caller hasn't committed.
+
+    Returns:
+        concurrent.futures.Future: The Future holding fn's result.
+    """
+    return _executor.submit(fn, *args)
@@ -1,11 +1,130 @@
-from database.db_manager import DBManager
+import functools
+import logging
+from database.db_manager import get_default_db_manager
+from services._query_cache import QueryCache
+from services import query_runner
 from models.semester_result import SemesterResult
 from models.student import Student
 from models.semester import Semester
 from models.academic_year import AcademicYear
-from models.exam import Exam
+from models.exam import Exam, EXAM_TYPE_SEMESTER_EXAM, EXAM_TYPE_CAT
 from models.exam_result import ExamResult
 
+logger = logging.getLogger(__name__)
+
+# Columns of the UNIQUE constraint identifying a semester result
+_SEMESTER_RESULT_KEY = ('student_id', 'semester_id', 'academic_year_id')
+
+# The fixed queries are module constants so the connection's statement cache
+# can reuse their compiled form on every call
+
+# Columns in SemesterResult.from_row order; a single seek on the UNIQUE index
+_SEMESTER_RESULT_BY_COMPOSITE_KEYS_QUERY = """
+    SELECT id, student_id, semester_id, academic_year_id, total_marks, average_score, grade_rank
+    FROM SemesterResults
+    WHERE student_id = ? AND semester_id = ? AND academic_year_id = ?
+    LIMIT 1
+"""
+
+_SEMESTER_RESULT_SELECT = """
+    SELECT
+        sr.id,
+        sr.student_id,
+        s.name AS student_name,
+        s.student_id AS student_unique_id,
+        sr.semester_id,
+        sem.name AS semester_name,
+        sr.academic_year_id,
+        ay.year_name AS academic_year_name,
+        sr.total_marks,
+        sr.average_score,
+        sr.grade_rank
+    FROM SemesterResults sr
+    JOIN Students s ON sr.student_id = s.id
+    JOIN Semesters sem ON sr.semester_id = sem.id
+    JOIN AcademicYears ay ON sr.academic_year_id = ay.id
+"""
+
+_BY_PERIOD_ORDER = "ay.year_name DESC, sem.name, s.name"
+
+@functools.lru_cache(maxsize=None)
+def _semester_results_query(conditions, order_by, limited=False):
+    """
+    Builds a semester result listing from _SEMESTER_RESULT_SELECT and the given
+    WHERE conditions. Each distinct listing is built once and the same string
+    returned afterwards, so it also reuses one compiled statement.
+
+    Args:
+        conditions (tuple[str]): Conditions joined with AND; may be empty.
+        order_by (str): The ORDER BY expression list.
+        limited (bool, optional): End with LIMIT ?. Defaults to False.
+    """
+    query = _SEMESTER_RESULT_SELECT
+    if conditions:
+        query += "    WHERE " + "\n    AND ".join(conditions) + "\n"
+    query += f"    ORDER BY {order_by}\n"
+    if limited:
+        query += "    LIMIT ?\n"
+    return query
+
+
+# The semester exams and CATs of a semester, found by their exam_type
+_SEMESTER_EXAMS_QUERY = """
+    SELECT id, exam_type, max_marks
+    FROM Exams
+    WHERE academic_year_id = ? AND semester_id = ? AND exam_type IS NOT NULL
+"""
+
+# Totals per student for a semester, based on the functional requirement:
+# "final result for each semester based on the sum of semester exam scores
+# and the average scores for CAT 1 and CAT 2."
+# For each subject: (Semester Exam score) + (average of its CAT scores), and the same
+# for the max marks; then summed across the subjects where any exam counted.
+# The enrolled students are then ranked within their grade (ties share a rank, and the
+# next rank is skipped), so only one finished row per student leaves SQLite.
+_SEMESTER_TOTALS_QUERY = """
+    WITH subject_totals AS (
+        SELECT
+            er.student_id,
+            COALESCE(MAX(CASE WHEN e.exam_type = :semester_exam THEN er.marks END), 0)
+                + COALESCE(AVG(CASE WHEN e.exam_type = :cat THEN er.marks END), 0) AS total,
+            COALESCE(MAX(CASE WHEN e.exam_type = :semester_exam THEN e.max_marks END), 0)
+                + COALESCE(AVG(CASE WHEN e.exam_type = :cat THEN e.max_marks END), 0) AS possible
+        FROM ExamResults er
+        JOIN Exams e ON er.exam_id = e.id
+        WHERE e.academic_year_id = :academic_year_id AND e.semester_id = :semester_id
+        AND e.exam_type IS NOT NULL
+        GROUP BY er.student_id, er.subject_id
+    ),
+    student_totals AS (
+        SELECT
+            student_id,
+            TOTAL(CASE WHEN possible > 0 THEN total END) AS total_marks,
+            TOTAL(CASE WHEN possible > 0 THEN possible END) AS total_possible,
+            COUNT(CASE WHEN possible > 0 THEN 1 END) AS num_subjects
+        FROM subject_totals
+        GROUP BY student_id
+    ),
+    student_scores AS (
+        SELECT
+            st.student_id,
+            st.total_marks,
+            CASE WHEN st.total_possible > 0 THEN st.total_marks / st.total_possible * 100 ELSE 0.0 END
+                AS average_score,
+            s.current_grade_id AS grade_id
+        FROM student_totals st
+        JOIN Students s ON st.student_id = s.id
+        JOIN Enrollments en ON en.student_id = st.student_id AND en.academic_year_id = :academic_year_id
+        WHERE st.num_subjects > 0
+    )
+    SELECT
+        student_id,
+        total_marks,
+        average_score,
+        RANK() OVER (PARTITION BY grade_id ORDER BY average_score DESC) AS grade_rank
+    FROM student_scores
+"""
+
 
 class SemesterResultService:
     """
@@ -13,11 +132,16 @@ class SemesterResultService:
     including computation of semester results and ranking.
     """
 
-    def __init__(self):
+    def __init__(self, db_manager=None):
         """
         Initializes the SemesterResultService with a DBManager instance.
+
+        Args:
+            db_manager (DBManager, optional): The DBManager to use.
+                                              Defaults to the shared instance.
         """
-        self.db_manager = DBManager()
+        self.db_manager = db_manager or get_default_db_manager()
+        self._exam_cache = QueryCache(self.db_manager) # Exams of a semester, dropped when Exams changes
 
     def add_semester_result(self, student_id, semester_id, academic_year_id,
                             total_marks=None, average_score=None, grade_rank=None):
@@ -37,9 +161,6 @@ class SemesterResultService:
             SemesterResult or None: The created/updated SemesterResult object if successful, None otherwise.
         """
         try:
-            existing_result = self.get_semester_result_by_composite_keys(
-                student_id, semester_id, academic_year_id)
-
             semester_result_data = {
                 'student_id': student_id,
                 'semester_id': semester_id,
@@ -48,19 +169,11 @@ class SemesterResultService:
                 'average_score': average_score,
                 'grade_rank': grade_rank
             }
-
-            if existing_result:
-                # Update existing result
-                self.db_manager.update_one('SemesterResults', existing_result.id, semester_result_data)
-                return SemesterResult(id=existing_result.id, **semester_result_data)
-            else:
-                # Insert new result
-                new_id = self.db_manager.insert_one('SemesterResults', semester_result_data)
-                if new_id:
-                    return SemesterResult(id=new_id, **semester_result_data)
-            return None
-        except Exception as e:
-            print(f"Error adding/updating semester result: {e}")
+            # Inserts the result, or updates the existing one, in a single statement
+            result_id = self.db_manager.upsert_one('SemesterResults', semester_result_data, _SEMESTER_RESULT_KEY)
+            return SemesterResult(id=result_id, **semester_result_data)
+        except Exception:
+            logger.exception("Error adding/updating semester result")
             return None
 
     def get_semester_result_by_id(self, result_id):
@@ -88,9 +201,9 @@ class SemesterResultService:
         Returns:
             SemesterResult or None: The SemesterResult object if found, None otherwise.
         """
-        query = "SELECT * FROM SemesterResults WHERE student_id = ? AND semester_id = ? AND academic_year_id = ?"
-        data = self.db_manager.fetch_one(query, (student_id, semester_id, academic_year_id))
-        return SemesterResult.from_dict(data) if data else None
+        row = self.db_manager.execute_query(_SEMESTER_RESULT_BY_COMPOSITE_KEYS_QUERY,
+                                            (student_id, semester_id, academic_year_id)).fetchone()
+        return SemesterResult.from_row(row) if row else None
 
     def get_semester_results_for_student(self, student_id):
         """
@@ -103,94 +216,79 @@ class SemesterResultService:
             list[dict]: A list of dictionaries, each representing a semester result
                         with semester and academic year names.
         """
-        query = """
-            SELECT
-                sr.id,
-                sr.student_id,
-                st.name AS student_name,
-                sr.semester_id,
-                sem.name AS semester_name,
-                sr.academic_year_id,
-                ay.year_name AS academic_year_name,
-                sr.total_marks,
-                sr.average_score,
-                sr.grade_rank
-            FROM SemesterResults sr
-            JOIN Students st ON sr.student_id = st.id
-            JOIN Semesters sem ON sr.semester_id = sem.id
-            JOIN AcademicYears ay ON sr.academic_year_id = ay.id
-            WHERE sr.student_id = ?
-            ORDER BY ay.year_name DESC, sem.name
-        """
+        query = _semester_results_query(('sr.student_id = ?',), _BY_PERIOD_ORDER)
         results_data = self.db_manager.fetch_all(query, (student_id,))
         return results_data
 
-    def get_semester_results_by_academic_year_and_grade(self, academic_year_id, grade_id):
+    def get_semester_results_by_academic_year_and_grade(self, academic_year_id, grade_id, limit=None, after=None):
         """
         Retrieves all semester results for students in a specific grade
         within a given academic year.
+        With a limit, returns one page ordered by average score and then ID instead;
+        pass the (average_score, id) of the last result of a page as after to get the next one.
 
         Args:
             academic_year_id (int): The ID of the academic year.
             grade_id (int): The ID of the grade.
+            limit (int, optional): Maximum number of results to return.
+                                   Defaults to None (all results).
+            after (tuple, optional): The (average_score, id) of the last result of the
+                                     previous page. Defaults to None (first page).
 
         Returns:
             list[dict]: A list of dictionaries, each representing a semester result
                         with student, semester, academic year, and grade names.
         """
-        query = """
-            SELECT
-                sr.id,
-                sr.student_id,
-                s.name AS student_name,
-                s.student_id AS student_unique_id,
-                sr.semester_id,
-                sem.name AS semester_name,
-                sr.academic_year_id,
-                ay.year_name AS academic_year_name,
-                sr.total_marks,
-                sr.average_score,
-                sr.grade_rank
-            FROM SemesterResults sr
-            JOIN Students s ON sr.student_id = s.id
-            JOIN Semesters sem ON sr.semester_id = sem.id
-            JOIN AcademicYears ay ON sr.academic_year_id = ay.id
-            WHERE sr.academic_year_id = ?
-            AND s.current_grade_id = ? -- Assuming current_grade_id reflects their grade for the year
-            ORDER BY sr.average_score DESC, s.name
-        """
-        results_data = self.db_manager.fetch_all(query, (academic_year_id, grade_id))
+        # Assuming current_grade_id reflects their grade for the year
+        conditions = ['sr.academic_year_id = ?', 's.current_grade_id = ?']
+        params = [academic_year_id, grade_id]
+        if limit is None:
+            order_by = "sr.average_score DESC, s.name"
+        else:
+            order_by = "sr.average_score DESC, sr.id DESC"
+            if after is not None:
+                conditions.append('(sr.average_score, sr.id) < (?, ?)')
+                params.extend(after)
+            params.append(limit)
+        query = _semester_results_query(tuple(conditions), order_by, limited=limit is not None)
+        results_data = self.db_manager.fetch_all(query, params)
         return results_data
 
-    def get_all_semester_results(self):
+    def get_all_semester_results(self, limit=None, after_id=0):
         """
         Retrieves all semester results from the database with related details.
+        With a limit, returns one page ordered by ID instead; pass the ID of the
+        last result of a page as after_id to get the next one.
+
+        Args:
+            limit (int, optional): Maximum number of results to return.
+                                   Defaults to None (all results, ordered by year, semester and name).
+            after_id (int, optional): Only return results with a greater ID. Defaults to 0.
 
         Returns:
             list[dict]: A list of dictionaries, each representing a semester result.
         """
-        query = """
-            SELECT
-                sr.id,
-                sr.student_id,
-                st.name AS student_name,
-                st.student_id AS student_unique_id,
-                sr.semester_id,
-                sem.name AS semester_name,
-                sr.academic_year_id,
-                ay.year_name AS academic_year_name,
-                sr.total_marks,
-                sr.average_score,
-                sr.grade_rank
-            FROM SemesterResults sr
-            JOIN Students st ON sr.student_id = st.id
-            JOIN Semesters sem ON sr.semester_id = sem.id
-            JOIN AcademicYears ay ON sr.academic_year_id = ay.id
-            ORDER BY ay.year_name DESC, sem.name, st.name
-        """
-        results_data = self.db_manager.fetch_all(query)
+        if limit is None:
+            return list(self.iter_all_semester_results())
+        query = _semester_results_query(('sr.id > ?',), "sr.id", limited=True)
+        results_data = self.db_manager.fetch_all(query, (after_id, limit))
         return results_data
 
+    def iter_all_semester_results(self, chunk_size=1000):
+        """
+        Streams all semester results with related details, reading chunk_size rows
+        from the database at a time. Suited to large reports and exports that
+        process results one by one.
+
+        Args:
+            chunk_size (int, optional): Number of rows fetched per round. Defaults to 1000.
+
+        Yields:
+            dict: A dictionary representing a semester result, as in get_all_semester_results().
+        """
+        query = _semester_results_query((), _BY_PERIOD_ORDER)
+        yield from self.db_manager.iter_all(query, chunk_size=chunk_size)
+
     def update_semester_result(self, result_id, total_marks=None, average_score=None, grade_rank=None):
         """
         Updates an existing semester result's computed values.
@@ -213,14 +311,14 @@ class SemesterResultService:
             update_data['grade_rank'] = grade_rank
 
         if not update_data:
-            print("No data provided for update.")
+            logger.warning("No data provided for update.")
             return False
 
         try:
             rows_affected = self.db_manager.update_one('SemesterResults', result_id, update_data)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error updating semester result (ID: {result_id}): {e}")
+        except Exception:
+            logger.exception("Error updating semester result (ID: %s)", result_id)
             return False
 
     def delete_semester_result(self, result_id):
@@ -236,8 +334,8 @@ class SemesterResultService:
         try:
             rows_affected = self.db_manager.delete_one('SemesterResults', result_id)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error deleting semester result (ID: {result_id}): {e}")
+        except Exception:
+            logger.exception("Error deleting semester result (ID: %s)", result_id)
             return False
 
     def compute_and_store_semester_results(self, academic_year_id, semester_id):
@@ -250,417 +348,124 @@ class SemesterResultService:
             academic_year_id (int): The ID of the academic year.
             semester_id (int): The ID of the semester.
         """
-        print(f"\n--- Computing Semester Results for AY {academic_year_id}, Semester {semester_id} ---")
+        # Reads and writes share one transaction, so the results are computed from a
+        # consistent snapshot and committed with a single fsync. Errors roll the whole
+        # run back and propagate, so the caller can report them.
+        with self.db_manager.transaction():
+            self._compute_semester_results(academic_year_id, semester_id)
 
-        # 1. Get all students enrolled in this academic year
-        # We need their current_grade_id to group them for ranking
-        query_students = """
-            SELECT
-                s.id AS student_id,
-                s.current_grade_id AS grade_id
-            FROM Students s
-            JOIN Enrollments e ON s.id = e.student_id
-            WHERE e.academic_year_id = ?
+    def _fetch_semester_totals(self, academic_year_id, semester_id):
         """
-        students_in_year = self.db_manager.fetch_all(query_students, (academic_year_id,))
+        Fetches every enrolled student's semester totals and rank within their grade,
+        aggregated and ranked by SQLite in a single query over the semester's exam
+        results, instead of one query per student.
 
-        if not students_in_year:
-            print("No students found enrolled in this academic year. No semester results to compute.")
-            return
+        Args:
+            academic_year_id (int): The ID of the academic year.
+            semester_id (int): The ID of the semester.
+
+        Returns:
+            sqlite3.Cursor: Rows of (student_id, total_marks, average_score, grade_rank).
+        """
+        return self.db_manager.execute_query(_SEMESTER_TOTALS_QUERY, {
+            'academic_year_id': academic_year_id,
+            'semester_id': semester_id,
+            'semester_exam': EXAM_TYPE_SEMESTER_EXAM,
+            'cat': EXAM_TYPE_CAT,
+        })
+
+    def compute_and_store_semester_results_for_periods(self, periods):
+        """
+        Computes and stores the semester results of several semesters at once, e.g.
+        after the marks of a whole academic year were re-imported.
+        The periods are independent, so their totals and ranks are computed in
+        parallel on the shared query pool (each worker reads on its own connection),
+        then all the results are stored in one transaction on the calling thread.
+
+        Args:
+            periods (list[tuple[int, int]]): (academic_year_id, semester_id) pairs.
+        """
+        periods = list(periods)
+        if self.db_manager.in_transaction():
+            # Workers can't see this thread's uncommitted writes; compute inline
+            period_rows = [self._semester_result_rows(*period) for period in periods]
+        else:
+            futures = [query_runner.submit(self._semester_result_rows_on_worker, *period) for period in periods]
+            # result() re-raises a worker's exception here, before anything is stored
+            period_rows = [future.result() for future in futures]
+        # Any failure rolls back every period's results and propagates to the caller
+        with self.db_manager.transaction():
+            for (academic_year_id, semester_id), rows in zip(periods, period_rows):
+                self._store_semester_results(academic_year_id, semester_id, rows)
+
+    def _semester_result_rows_on_worker(self, academic_year_id, semester_id):
+        """
+        Runs _semester_result_rows on a query pool worker, then closes the connection
+        the worker opened for it, so idle workers don't keep the database open.
+        """
+        try:
+            return self._semester_result_rows(academic_year_id, semester_id)
+        finally:
+            self.db_manager.close_connection()
+
+    def _compute_semester_results(self, academic_year_id, semester_id):
+        """
+        Does the work of compute_and_store_semester_results inside its transaction.
+        """
+        rows = self._semester_result_rows(academic_year_id, semester_id)
+        self._store_semester_results(academic_year_id, semester_id, rows)
 
-        # Get all exams (Semester Exam, CAT1, CAT2) for this semester and academic year
-        query_exams = """
-            SELECT id, name, max_marks
-            FROM Exams
-            WHERE academic_year_id = ? AND semester_id = ?
-            AND (name LIKE '%Semester%' OR name LIKE '%CAT%')
+    def _semester_result_rows(self, academic_year_id, semester_id):
         """
-        semester_exams = self.db_manager.fetch_all(query_exams, (academic_year_id, semester_id))
+        Computes the semester results of a semester without storing them.
+
+        Args:
+            academic_year_id (int): The ID of the academic year.
+            semester_id (int): The ID of the semester.
+
+        Returns:
+            list[dict]: The SemesterResults rows to store; empty if there is nothing to compute.
+        """
+        # Get the semester exams and CATs of this semester and academic year
+        semester_exams = self._exam_cache.fetch_all(
+            _SEMESTER_EXAMS_QUERY, (academic_year_id, semester_id), tables=('Exams',))
 
         if not semester_exams:
-            print(
-                f"No relevant exams (Semester Exam, CAT1, CAT2) found for Semester {semester_id}, AY {academic_year_id}. Cannot compute semester results.")
+            logger.info("No relevant exams (Semester Exam, CAT1, CAT2) found for Semester %s, AY %s. "
+                        "Cannot compute semester results.", semester_id, academic_year_id)
+            return []
+
+        # Totals and grade ranks of the enrolled students, computed by SQLite.
+        # The rows are unpacked as tuples, without building a dict per row.
+        semester_result_rows = [{
+            'student_id': student_id,
+            'semester_id': semester_id,
+            'academic_year_id': academic_year_id,
+            'total_marks': total_marks,
+            'average_score': average_score,
+            'grade_rank': grade_rank
+        } for student_id, total_marks, average_score, grade_rank in self._fetch_semester_totals(
+            academic_year_id, semester_id)]
+
+        if not semester_result_rows:
+            logger.info("No enrolled students with results for Semester %s, AY %s. "
+                        "No semester results to compute.", semester_id, academic_year_id)
+        return semester_result_rows
+
+    def _store_semester_results(self, academic_year_id, semester_id, semester_result_rows):
+        """
+        Stores computed semester results. Results whose total, average and rank are
+        unchanged since the last computation aren't rewritten.
+        """
+        if not semester_result_rows:
             return
+        self.db_manager.upsert_many('SemesterResults', semester_result_rows, _SEMESTER_RESULT_KEY,
+                                    skip_unchanged=True)
 
-        semester_exam_ids = [e['id'] for e in semester_exams if 'Semester' in e['name']]
-        cat_exam_ids = [e['id'] for e in semester_exams if 'CAT' in e['name']]
-
-        # Dictionary to hold results per student and their grade for ranking
-        student_semester_data = {}  # {student_id: {'total_marks': X, 'num_subjects': Y, 'grade_id': Z}}
-
-        for student_info in students_in_year:
-            student_id = student_info['student_id']
-            grade_id = student_info['grade_id']
-
-            total_semester_exam_marks = 0
-            total_cat_marks = 0
-            num_subjects_with_exam_results = 0
-
-            # Fetch all exam results for this student in this semester's exams
-            query_student_results = """
-                SELECT er.marks, e.name AS exam_name, e.max_marks AS exam_max_marks
-                FROM ExamResults er
-                JOIN Exams e ON er.exam_id = e.id
-                WHERE er.student_id = ? AND e.academic_year_id = ? AND e.semester_id = ?
-            """
-            student_exam_results = self.db_manager.fetch_all(query_student_results,
-                                                             (student_id, academic_year_id, semester_id))
-
-            if not student_exam_results:
-                # print(f"No exam results found for student {student_id} in Semester {semester_id}. Skipping.")
-                continue  # Skip students with no results for this semester
-
-            # Group results by subject to ensure we count each subject once for average
-            subject_marks = {}  # {subject_id: {'exam_marks': [], 'cat_marks': []}}
-
-            # Aggregate marks per subject from all relevant exams
-            for res in student_exam_results:
-                exam_name = res['exam_name']
-                marks = res['marks']
-                exam_max_marks = res['exam_max_marks']
-
-                # Determine if it's a semester exam or a CAT
-                if 'Semester' in exam_name:
-                    total_semester_exam_marks += marks
-                elif 'CAT' in exam_name:
-                    total_cat_marks += marks
-
-            # For simplicity, let's assume total_marks is sum of all relevant exam marks
-            # And average_score is total_marks / (number of subjects * number of main exams/CATs)
-            # A more robust system would calculate average per subject, then sum averages.
-
-            # Simplified calculation based on total marks from all relevant exams
-            # This needs to be refined based on how 'average scores' are truly calculated.
-            # Let's assume for now: (Sum of Semester Exam Scores) + (Average of CAT 1 & CAT 2)
-            # This requires knowing how many subjects the student took and how many main exams/CATs there are.
-
-            # Revised Calculation Logic:
-            # Sum of Semester Exam scores + Sum of CAT scores (assuming CATs are weighted equally)
-            # Total possible marks for the semester for a student will depend on the number of subjects
-            # and the max marks for each exam type (Semester Exam, CAT1, CAT2)
-            # This is complex without knowing the number of subjects per student.
-
-            # Let's simplify: Sum of all recorded marks for main exams and CATs for this semester
-            # Average will be total marks / count of *valid* marks entries.
-            # This assumes all subjects have results for all relevant exams.
-
-            # Let's get actual subjects for the student for this academic year and grade
-            query_student_subjects = """
-                SELECT DISTINCT s.id AS subject_id
-                FROM Subjects s
-                JOIN ExamResults er ON s.id = er.subject_id
-                JOIN Exams e ON er.exam_id = e.id
-                WHERE er.student_id = ?
-                AND e.academic_year_id = ?
-                AND e.semester_id = ?
-            """
-            student_subjects_in_semester = self.db_manager.fetch_all(query_student_subjects,
-                                                                     (student_id, academic_year_id, semester_id))
-            num_subjects_with_results = len(student_subjects_in_semester)
-
-            if num_subjects_with_results == 0:
-                print(f"Student {student_id} has no subjects with results in Semester {semester_id}. Skipping.")
-                continue
-
-            # Calculate total marks and average score for the semester
-            # Based on the functional requirement:
-            # "final result for each semester based on the sum of semester exam scores
-            # and the average scores for CAT 1 and CAT 2."
-            # This implies a per-subject calculation then aggregation.
-
-            # Let's refine:
-            # For each subject, get Semester Exam score and average CAT scores.
-            # Sum these per-subject totals for the overall semester total.
-            # Average is overall semester total / (number of subjects * (1 main exam + 1 average CAT score))
-            # This is still tricky without knowing which CATs apply to which subjects.
-
-            # Simpler interpretation:
-            # Total marks = sum of all marks from "Semester X Exam" + sum of marks from "CAT 1" + sum of marks from "CAT 2"
-            # Average score = Total marks / (Number of subjects * (Max marks of Semester Exam + Avg Max Marks of CATs))
-            # This needs a more direct way to get all subjects a student is taking.
-
-            # Let's assume, for now, that "sum of semester exam scores" means the sum of scores
-            # from the 'Semester X Exam' for all subjects.
-            # And "average scores for CAT 1 and CAT 2" means (CAT1_score + CAT2_score) / 2 for each subject,
-            # and then summing these averages across subjects.
-
-            total_semester_score = 0.0
-            total_possible_semester_score = 0.0
-            num_subjects_counted = 0
-
-            # Get all subjects a student has results for in this semester
-            query_subjects_with_results = """
-                SELECT DISTINCT er.subject_id, s.name AS subject_name
-                FROM ExamResults er
-                JOIN Subjects s ON er.subject_id = s.id
-                JOIN Exams e ON er.exam_id = e.id
-                WHERE er.student_id = ? AND e.academic_year_id = ? AND e.semester_id = ?
-            """
-            subjects_with_results = self.db_manager.fetch_all(query_subjects_with_results,
-                                                              (student_id, academic_year_id, semester_id))
-
-            for subject_entry in subjects_with_results:
-                subject_id = subject_entry['subject_id']
-
-                # Get Semester Exam score for this subject
-                sem_exam_query = """
-                    SELECT er.marks, e.max_marks
-                    FROM ExamResults er
-                    JOIN Exams e ON er.exam_id = e.id
-                    WHERE er.student_id = ? AND er.subject_id = ? AND e.academic_year_id = ? AND e.semester_id = ? AND e.name LIKE '%Semester%Exam%'
-                """
-                sem_exam_result = self.db_manager.fetch_one(sem_exam_query,
-                                                            (student_id, subject_id, academic_year_id, semester_id))
-
-                subject_semester_exam_score = sem_exam_result['marks'] if sem_exam_result else 0.0
-                subject_semester_exam_max_marks = sem_exam_result['max_marks'] if sem_exam_result else 0.0
-
-                # Get CAT scores for this subject
-                cat_scores = []
-                cat_max_marks = []
-                cat_query = """
-                    SELECT er.marks, e.max_marks
-                    FROM ExamResults er
-                    JOIN Exams e ON er.exam_id = e.id
-                    WHERE er.student_id = ? AND er.subject_id = ? AND e.academic_year_id = ? AND e.semester_id = ? AND e.name LIKE '%CAT%'
-                """
-                cat_results = self.db_manager.fetch_all(cat_query,
-                                                        (student_id, subject_id, academic_year_id, semester_id))
-
-                for cat_res in cat_results:
-                    cat_scores.append(cat_res['marks'])
-                    cat_max_marks.append(cat_res['max_marks'])
-
-                avg_cat_score = sum(cat_scores) / len(cat_scores) if cat_scores else 0.0
-                avg_cat_max_marks = sum(cat_max_marks) / len(cat_max_marks) if cat_max_marks else 0.0
-
-                # Compute per-subject total for the semester
-                # "sum of semester exam scores and the average scores for CAT 1 and CAT 2."
-                # This implies: (Semester Exam Score) + (Average of CAT scores)
-                subject_total_for_semester = subject_semester_exam_score + avg_cat_score
-                subject_possible_total_for_semester = subject_semester_exam_max_marks + avg_cat_max_marks
-
-                if subject_possible_total_for_semester > 0:  # Only count subjects where there were actual exams
-                    total_semester_score += subject_total_for_semester
-                    total_possible_semester_score += subject_possible_total_for_semester
-                    num_subjects_counted += 1
-
-            if num_subjects_counted == 0:
-                print(f"Student {student_id} has no valid subject results for semester calculation. Skipping.")
-                continue
-
-            average_score = (
-                                        total_semester_score / total_possible_semester_score) * 100 if total_possible_semester_score > 0 else 0.0
-
-            student_semester_data[student_id] = {
-                'total_marks': total_semester_score,
-                'average_score': average_score,
-                'grade_id': grade_id  # For ranking
-            }
+        if logger.isEnabledFor(logging.DEBUG): # Skip the per-student loop unless it's logged
+            for row in semester_result_rows:
+                logger.debug("Computed/Stored Semester Result for Student %s: Total=%.2f, Avg=%.2f%%, Rank=%s",
+                             row['student_id'], row['total_marks'], row['average_score'], row['grade_rank'])
 
-        # 2. Compute ranks per grade
-        grades_in_year = sorted(
-            list(set([s['grade_id'] for s in students_in_year if s['student_id'] in student_semester_data])))
-
-        for grade_id in grades_in_year:
-            # Filter students belonging to this grade and who have computed results
-            students_in_grade = [
-                (s_id, data['average_score'])
-                for s_id, data in student_semester_data.items()
-                if data['grade_id'] == grade_id
-            ]
-            # Sort by average score in descending order
-            students_in_grade.sort(key=lambda x: x[1], reverse=True)
-
-            current_rank = 1
-            prev_score = -1  # Sentinel value
-            for i, (s_id, avg_score) in enumerate(students_in_grade):
-                if avg_score != prev_score:
-                    current_rank = i + 1
-                student_semester_data[s_id]['grade_rank'] = current_rank
-                prev_score = avg_score
-
-        # 3. Store/Update results in SemesterResults table
-        for student_id, data in student_semester_data.items():
-            self.add_semester_result(
-                student_id=student_id,
-                semester_id=semester_id,
-                academic_year_id=academic_year_id,
-                total_marks=data['total_marks'],
-                average_score=data['average_score'],
-                grade_rank=data['grade_rank']
-            )
-            print(
-                f"Computed/Stored Semester Result for Student {student_id}: Total={data['total_marks']:.2f}, Avg={data['average_score']:.2f}%, Rank={data['grade_rank']}")
-
-        print("Semester result computation complete.")
-
-
-# Example Usage (for testing purposes)
-if __name__ == '__main__':
-    semester_result_service = SemesterResultService()
-    db_manager = DBManager()  # For fetching IDs for testing
-
-    # --- Setup Test Data (ensure these exist from previous tests or insert them) ---
-    # Grades
-    grade1_id = db_manager.get_grade_by_name('Grade 1')['id'] if db_manager.get_grade_by_name(
-        'Grade 1') else db_manager.insert_one('Grades', {'name': 'Grade 1'})
-    grade2_id = db_manager.get_grade_by_name('Grade 2')['id'] if db_manager.get_grade_by_name(
-        'Grade 2') else db_manager.insert_one('Grades', {'name': 'Grade 2'})
-    grade8_id = db_manager.get_grade_by_name('Grade 8')['id'] if db_manager.get_grade_by_name(
-        'Grade 8') else db_manager.insert_one('Grades', {'name': 'Grade 8'})
-
-    # Academic Year and Semesters
-    ay_2023_2024_id = db_manager.get_academic_year_by_name('2023/2024')['id'] if db_manager.get_academic_year_by_name(
-        '2023/2024') else db_manager.insert_one('AcademicYears', {'year_name': '2023/2024', 'start_date': '2023-09-01',
-                                                                  'end_date': '2024-07-31'})
-    sem1_id = db_manager.get_semester_by_name('Semester 1')['id'] if db_manager.get_semester_by_name(
-        'Semester 1') else db_manager.insert_one('Semesters', {'name': 'Semester 1', 'start_date': '2023-09-01',
-                                                               'end_date': '2024-01-31'})
-    sem2_id = db_manager.get_semester_by_name('Semester 2')['id'] if db_manager.get_semester_by_name(
-        'Semester 2') else db_manager.insert_one('Semesters', {'name': 'Semester 2', 'start_date': '2024-02-01',
-                                                               'end_date': '2024-07-31'})
-
-    # Students (ensure their current_grade_id is set correctly for ranking)
-    student_john_id = db_manager.get_student_by_unique_id('S001')['id'] if db_manager.get_student_by_unique_id(
-        'S001') else db_manager.insert_one('Students', {'name': 'John Doe', 'student_id': 'S001',
-                                                        'contact_info': 'john@example.com',
-                                                        'current_grade_id': grade1_id})
-    student_jane_id = db_manager.get_student_by_unique_id('S002')['id'] if db_manager.get_student_by_unique_id(
-        'S002') else db_manager.insert_one('Students', {'name': 'Jane Smith', 'student_id': 'S002',
-                                                        'contact_info': 'jane@example.com',
-                                                        'current_grade_id': grade1_id})  # Jane also in Grade 1 for ranking test
-    student_mike_id = db_manager.get_student_by_unique_id('S003')['id'] if db_manager.get_student_by_unique_id(
-        'S003') else db_manager.insert_one('Students', {'name': 'Mike Brown', 'student_id': 'S003',
-                                                        'contact_info': 'mike@example.com',
-                                                        'current_grade_id': grade2_id})
-
-    # Subjects
-    math_id = db_manager.get_subject_by_name('Mathematics')['id'] if db_manager.get_subject_by_name(
-        'Mathematics') else db_manager.insert_one('Subjects', {'name': 'Mathematics'})
-    science_id = db_manager.get_subject_by_name('Science')['id'] if db_manager.get_subject_by_name(
-        'Science') else db_manager.insert_one('Subjects', {'name': 'Science'})
-    english_id = db_manager.get_subject_by_name('English')['id'] if db_manager.get_subject_by_name(
-        'English') else db_manager.insert_one('Subjects', {'name': 'English'})
-
-    # Enrollments (important for `compute_and_store_semester_results` to find students)
-    db_manager.insert_one('Enrollments',
-                          {'student_id': student_john_id, 'academic_year_id': ay_2023_2024_id, 'grade_id': grade1_id})
-    db_manager.insert_one('Enrollments',
-                          {'student_id': student_jane_id, 'academic_year_id': ay_2023_2024_id, 'grade_id': grade1_id})
-    db_manager.insert_one('Enrollments',
-                          {'student_id': student_mike_id, 'academic_year_id': ay_2023_2024_id, 'grade_id': grade2_id})
-
-    # Exams
-    exam_s1_23_id = db_manager.get_exam_by_name_and_period("Semester 1 Exam", ay_2023_2024_id, sem1_id)[
-        'id'] if db_manager.get_exam_by_name_and_period("Semester 1 Exam", ay_2023_2024_id,
-                                                        sem1_id) else db_manager.insert_one('Exams',
-                                                                                            {'name': 'Semester 1 Exam',
-                                                                                             'academic_year_id': ay_2023_2024_id,
-                                                                                             'semester_id': sem1_id,
-                                                                                             'max_marks': 100})
-    cat1_s1_23_id = db_manager.get_exam_by_name_and_period("CAT 1", ay_2023_2024_id, sem1_id)[
-        'id'] if db_manager.get_exam_by_name_and_period("CAT 1", ay_2023_2024_id, sem1_id) else db_manager.insert_one(
-        'Exams', {'name': 'CAT 1', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem1_id, 'max_marks': 30})
-    cat2_s1_23_id = db_manager.get_exam_by_name_and_period("CAT 2", ay_2023_2024_id, sem1_id)[
-        'id'] if db_manager.get_exam_by_name_and_period("CAT 2", ay_2023_2024_id, sem1_id) else db_manager.insert_one(
-        'Exams', {'name': 'CAT 2', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem1_id, 'max_marks': 30})
-
-    # Exam Results (ensure these are added before computing semester results)
-    # John Doe (Grade 1)
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': exam_s1_23_id, 'subject_id': math_id, 'marks': 70})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': cat1_s1_23_id, 'subject_id': math_id, 'marks': 25})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': cat2_s1_23_id, 'subject_id': math_id, 'marks': 28})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': exam_s1_23_id, 'subject_id': science_id,
-                           'marks': 65})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': cat1_s1_23_id, 'subject_id': science_id,
-                           'marks': 20})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': cat2_s1_23_id, 'subject_id': science_id,
-                           'marks': 22})
-
-    # Jane Smith (Grade 1)
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': exam_s1_23_id, 'subject_id': math_id, 'marks': 80})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': cat1_s1_23_id, 'subject_id': math_id, 'marks': 28})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': cat2_s1_23_id, 'subject_id': math_id, 'marks': 29})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': exam_s1_23_id, 'subject_id': english_id,
-                           'marks': 75})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': cat1_s1_23_id, 'subject_id': english_id,
-                           'marks': 26})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': cat2_s1_23_id, 'subject_id': english_id,
-                           'marks': 27})
-
-    # Mike Brown (Grade 2)
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_mike_id, 'exam_id': exam_s1_23_id, 'subject_id': math_id, 'marks': 90})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_mike_id, 'exam_id': cat1_s1_23_id, 'subject_id': math_id, 'marks': 29})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_mike_id, 'exam_id': cat2_s1_23_id, 'subject_id': math_id, 'marks': 30})
-
-    print("\n--- Testing SemesterResultService ---")
-
-    # Compute and store semester results
-    semester_result_service.compute_and_store_semester_results(ay_2023_2024_id, sem1_id)
-
-    # Get all semester results
-    print("\nAll Semester Results:")
-    all_semester_results = semester_result_service.get_all_semester_results()
-    for r in all_semester_results:
-        print(r)
-
-    # Get semester results for a specific student
-    if student_john_id:
-        print(f"\nSemester Results for John Doe (ID: {student_john_id}):")
-        john_semester_results = semester_result_service.get_semester_results_for_student(student_john_id)
-        for r in john_semester_results:
-            print(r)
-
-    # Get semester results by academic year and grade
-    if ay_2023_2024_id and grade1_id:
-        print(f"\nSemester Results for 2023/2024, Grade 1:")
-        grade1_semester_results = semester_result_service.get_semester_results_by_academic_year_and_grade(
-            ay_2023_2024_id, grade1_id)
-        for r in grade1_semester_results:
-            print(r)
-
-    # Update a semester result (e.g., if re-computation changes rank or scores)
-    # This is typically handled by `compute_and_store_semester_results` itself
-    # but provided for direct update capability if needed.
-    # if all_semester_results:
-    #     first_result_id = all_semester_results[0]['id']
-    #     print(f"\nUpdating first semester result (ID: {first_result_id})...")
-    #     updated = semester_result_service.update_semester_result(first_result_id, total_marks=150.0, average_score=75.0, grade_rank=99)
-    #     if updated:
-    #         updated_result = semester_result_service.get_semester_result_by_id(first_result_id)
-    #         print(f"Updated: {updated_result}")
-    #     else:
-    #         print("Failed to update semester result.")
-
-    # Delete a semester result (use with caution)
-    # if all_semester_results:
-    #     last_result_id = all_semester_results[-1]['id']
-    #     print(f"\nDeleting last semester result (ID: {last_result_id})...")
-    #     deleted = semester_result_service.delete_semester_result(last_result_id)
-    #     if deleted:
-    #         print("Semester result deleted successfully.")
-    #     else:
-    #         print("Failed to delete semester result.")
-
-    print("\nAll Semester Results after operations:")
-    all_semester_results_after = semester_result_service.get_all_semester_results()
-    for r in all_semester_results_after:
-        print(r)
-
-    db_manager.close_connection()  # Close connection after testing
+        logger.info("Computed %d semester results for Semester %s, AY %s.",
+                    len(semester_result_rows), semester_id, academic_year_id)
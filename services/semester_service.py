@@ -1,16 +1,30 @@
-from database.db_manager import DBManager
+import logging
+from database.db_manager import get_default_db_manager
+from services._refcache import ModelCache
 from models.semester import Semester
 
+logger = logging.getLogger(__name__)
+
+# Columns in Semester.from_row order
+_ALL_SEMESTERS_QUERY = "SELECT id, name, start_date, end_date FROM Semesters ORDER BY name"
+
 class SemesterService:
     """
     Manages business logic related to Semester operations.
     Interacts with the DBManager to perform CRUD operations on Semester data.
     """
-    def __init__(self):
+    # Semesters rarely change, so lookups are served from memory (shared by all instances)
+    _cache = ModelCache('Semesters', _ALL_SEMESTERS_QUERY, Semester)
+
+    def __init__(self, db_manager=None):
         """
         Initializes the SemesterService with a DBManager instance.
+
+        Args:
+            db_manager (DBManager, optional): The DBManager to use.
+                                              Defaults to the shared instance.
         """
-        self.db_manager = DBManager()
+        self.db_manager = db_manager or get_default_db_manager()
 
     def add_semester(self, name, start_date=None, end_date=None):
         """
@@ -30,8 +44,8 @@ class SemesterService:
             if new_id:
                 return Semester(id=new_id, **semester_data)
             return None
-        except Exception as e:
-            print(f"Error adding semester: {e}")
+        except Exception:
+            logger.exception("Error adding semester")
             return None
 
     def get_semester_by_id(self, semester_id):
@@ -44,8 +58,7 @@ class SemesterService:
         Returns:
             Semester or None: The Semester object if found, None otherwise.
         """
-        data = self.db_manager.get_by_id('Semesters', semester_id)
-        return Semester.from_dict(data) if data else None
+        return self._cache.get_by_id(self.db_manager, semester_id)
 
     def get_semester_by_name(self, name):
         """
@@ -57,9 +70,7 @@ class SemesterService:
         Returns:
             Semester or None: The Semester object if found, None otherwise.
         """
-        query = "SELECT * FROM Semesters WHERE name = ?"
-        data = self.db_manager.fetch_one(query, (name,))
-        return Semester.from_dict(data) if data else None
+        return self._cache.get_by_name(self.db_manager, name)
 
     def get_all_semesters(self):
         """
@@ -68,8 +79,14 @@ class SemesterService:
         Returns:
             list[Semester]: A list of Semester objects.
         """
-        semesters_data = self.db_manager.get_all('Semesters', order_by='name')
-        return [Semester.from_dict(data) for data in semesters_data]
+        return self._cache.get_all(self.db_manager)
+
+    def clear_cache(self):
+        """
+        Forces the next lookup to reload the semesters, e.g. after the database
+        was changed outside this application.
+        """
+        self._cache.clear()
 
     def update_semester(self, semester_id, name=None, start_date=None, end_date=None):
         """
@@ -93,14 +110,22 @@ class SemesterService:
             update_data['end_date'] = end_date
 
         if not update_data:
-            print("No data provided for update.")
+            logger.warning("No data provided for update.")
+            return False
+
+        # Skip the write when the semester already has these values (e.g. "Save" without edits)
+        current = self.get_semester_by_id(semester_id)
+        if current is None:
             return False
+        update_data = {k: v for k, v in update_data.items() if getattr(current, k) != v}
+        if not update_data:
+            return True
 
         try:
             rows_affected = self.db_manager.update_one('Semesters', semester_id, update_data)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error updating semester (ID: {semester_id}): {e}")
+        except Exception:
+            logger.exception("Error updating semester (ID: %s)", semester_id)
             return False
 
     def delete_semester(self, semester_id):
@@ -118,58 +143,6 @@ class SemesterService:
         try:
             rows_affected = self.db_manager.delete_one('Semesters', semester_id)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error deleting semester (ID: {semester_id}): {e}")
+        except Exception:
+            logger.exception("Error deleting semester (ID: %s)", semester_id)
             return False
-
-# Example Usage (for testing purposes)
-if __name__ == '__main__':
-    semester_service = SemesterService()
-
-    print("\n--- Testing SemesterService ---")
-
-    # Add semesters (Semester 1 and Semester 2 should be in schema.py initial setup)
-    print("Adding extra semester 'Summer Term'...")
-    summer_term = semester_service.add_semester("Summer Term", "2024-07-01", "2024-08-31")
-    if summer_term:
-        print(f"Added: {summer_term}")
-    else:
-        print("Failed to add Summer Term (might already exist).")
-
-    # Get all semesters
-    print("\nAll Semesters:")
-    all_semesters = semester_service.get_all_semesters()
-    for s in all_semesters:
-        print(s)
-
-    # Update a semester
-    if summer_term:
-        print(f"\nUpdating Summer Term (ID: {summer_term.id})...")
-        updated = semester_service.update_semester(summer_term.id, end_date="2024-09-15")
-        if updated:
-            updated_sem = semester_service.get_semester_by_id(summer_term.id)
-            print(f"Updated: {updated_sem}")
-        else:
-            print("Failed to update Summer Term.")
-
-    # Get semester by name
-    print("\nGetting semester by name 'Semester 1':")
-    found_sem1 = semester_service.get_semester_by_name("Semester 1")
-    if found_sem1:
-        print(f"Found: {found_sem1}")
-    else:
-        print("Semester 1 not found.")
-
-    # Delete a semester (use with caution)
-    # if summer_term:
-    #     print(f"\nDeleting Summer Term (ID: {summer_term.id})...")
-    #     deleted = semester_service.delete_semester(summer_term.id)
-    #     if deleted:
-    #         print("Summer Term deleted successfully.")
-    #     else:
-    #         print("Failed to delete Summer Term.")
-
-    print("\nAll Semesters after operations:")
-    all_semesters_after = semester_service.get_all_semesters()
-    for s in all_semesters_after:
-        print(s)
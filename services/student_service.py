@@ -1,17 +1,37 @@
-from database.db_manager import DBManager
+import logging
+from database.db_manager import get_default_db_manager
 from models.student import Student
 from models.grade import Grade # Import Grade model to fetch grade names
+from services.grade_service import GradeService
+
+logger = logging.getLogger(__name__)
+
+# Columns in Student.from_row order
+_STUDENT_SELECT = "SELECT id, name, student_id, contact_info, current_grade_id FROM Students"
+_STUDENT_BY_ID_QUERY = _STUDENT_SELECT + " WHERE id = ?"
+_STUDENT_BY_UNIQUE_ID_QUERY = _STUDENT_SELECT + " WHERE student_id = ?"
+
+# Grade names are filled in from GradeService's in-memory grade cache rather than
+# joined in on every refresh of the student list
+_ALL_STUDENTS_QUERY = _STUDENT_SELECT + " ORDER BY name"
+# Served by ix_students_grade, which also returns the rows in name order
+_STUDENTS_BY_GRADE_QUERY = _STUDENT_SELECT + " WHERE current_grade_id = ? ORDER BY name"
 
 class StudentService:
     """
     Manages business logic related to Student operations.
     Interacts with the DBManager to perform CRUD operations on Student data.
     """
-    def __init__(self):
+    def __init__(self, db_manager=None):
         """
         Initializes the StudentService with a DBManager instance.
+
+        Args:
+            db_manager (DBManager, optional): The DBManager to use.
+                                              Defaults to the shared instance.
         """
-        self.db_manager = DBManager()
+        self.db_manager = db_manager or get_default_db_manager()
+        self.grade_service = GradeService(self.db_manager) # Cached grade lookups
 
     def add_student(self, name, student_id, contact_info, current_grade_id):
         """
@@ -38,10 +58,34 @@ class StudentService:
                 # Return the newly created student object with its ID
                 return Student(id=new_id, **student_data)
             return None
-        except Exception as e:
-            print(f"Error adding student: {e}")
+        except Exception:
+            logger.exception("Error adding student")
             return None
 
+    def add_students(self, students):
+        """
+        Adds several students at once with a single executemany() call in one transaction.
+        Students whose student_id already exists are skipped.
+
+        Args:
+            students (list[dict]): Dictionaries with 'name', 'student_id', 'contact_info'
+                                   and 'current_grade_id' keys.
+
+        Returns:
+            int: The number of students added.
+        """
+        rows = [{
+            'name': student['name'],
+            'student_id': student['student_id'],
+            'contact_info': student.get('contact_info'),
+            'current_grade_id': student.get('current_grade_id')
+        } for student in students]
+        try:
+            return self.db_manager.insert_many('Students', rows, ignore_duplicates=True)
+        except Exception:
+            logger.exception("Error adding students")
+            return 0
+
     def get_student_by_id(self, student_id):
         """
         Retrieves a student by their database ID.
@@ -52,8 +96,8 @@ class StudentService:
         Returns:
             Student or None: The Student object if found, None otherwise.
         """
-        data = self.db_manager.get_by_id('Students', student_id)
-        return Student.from_dict(data) if data else None
+        row = self.db_manager.execute_query(_STUDENT_BY_ID_QUERY, (student_id,)).fetchone()
+        return Student.from_row(row) if row else None
 
     def get_student_by_unique_id(self, unique_student_id):
         """
@@ -65,9 +109,8 @@ class StudentService:
         Returns:
             Student or None: The Student object if found, None otherwise.
         """
-        query = "SELECT * FROM Students WHERE student_id = ?"
-        data = self.db_manager.fetch_one(query, (unique_student_id,))
-        return Student.from_dict(data) if data else None
+        row = self.db_manager.execute_query(_STUDENT_BY_UNIQUE_ID_QUERY, (unique_student_id,)).fetchone()
+        return Student.from_row(row) if row else None
 
     def get_all_students(self):
         """
@@ -77,21 +120,46 @@ class StudentService:
             list[dict]: A list of dictionaries, each representing a student
                         with their grade name included.
         """
-        query = """
-            SELECT
-                s.id,
-                s.name,
-                s.student_id,
-                s.contact_info,
-                s.current_grade_id,
-                g.name AS grade_name
-            FROM Students s
-            LEFT JOIN Grades g ON s.current_grade_id = g.id
-            ORDER BY s.name
-        """
-        students_data = self.db_manager.fetch_all(query)
-        # Convert to list of dictionaries for easier consumption by GUI
-        return students_data
+        # List of dictionaries for easier consumption by GUI
+        return list(self.iter_all_students())
+
+    def iter_all_students(self, chunk_size=1000):
+        """
+        Streams all students with their grade names, reading chunk_size rows from
+        the database at a time. Suited to large student lists and exports that
+        process students one by one.
+
+        Args:
+            chunk_size (int, optional): Number of rows fetched per round. Defaults to 1000.
+
+        Yields:
+            dict: A dictionary representing a student, as in get_all_students().
+        """
+        yield from self._with_grade_names(self.db_manager.iter_all(_ALL_STUDENTS_QUERY, chunk_size=chunk_size))
+
+    def get_students_by_grade(self, grade_id):
+        """
+        Retrieves the students currently in a grade, including their grade names.
+        The grade is filtered in SQL, so only the matching rows are read.
+
+        Args:
+            grade_id (int): The ID of the grade.
+
+        Returns:
+            list[dict]: A list of dictionaries, each representing a student
+                        with their grade name included.
+        """
+        return list(self._with_grade_names(
+            self.db_manager.iter_all(_STUDENTS_BY_GRADE_QUERY, (grade_id,))))
+
+    def _with_grade_names(self, students_data):
+        """
+        Adds each student's grade name to the student dictionaries, one at a time.
+        """
+        grade_names = self.grade_service.get_grade_names()
+        for student_data in students_data:
+            student_data['grade_name'] = grade_names.get(student_data['current_grade_id'])
+            yield student_data
 
     def update_student(self, student_id, name=None, student_unique_id=None, contact_info=None, current_grade_id=None):
         """
@@ -118,16 +186,42 @@ class StudentService:
             update_data['current_grade_id'] = current_grade_id
 
         if not update_data:
-            print("No data provided for update.")
+            logger.warning("No data provided for update.")
             return False
 
+        # Skip the write when the student already has these values (e.g. "Save" without edits)
+        current = self.get_student_by_id(student_id)
+        if current is None:
+            return False
+        update_data = {k: v for k, v in update_data.items() if getattr(current, k) != v}
+        if not update_data:
+            return True
+
         try:
             rows_affected = self.db_manager.update_one('Students', student_id, update_data)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error updating student (ID: {student_id}): {e}")
+        except Exception:
+            logger.exception("Error updating student (ID: %s)", student_id)
             return False
 
+    def update_students(self, updates):
+        """
+        Updates several students at once (e.g. promoting a class to the next grade)
+        with a single executemany() call in one transaction.
+
+        Args:
+            updates (list[dict]): Dictionaries with the student's database 'id' and the
+                                  columns to change; all must change the same columns.
+
+        Returns:
+            int: The number of students updated.
+        """
+        try:
+            return self.db_manager.update_many('Students', updates)
+        except Exception:
+            logger.exception("Error updating students")
+            return 0
+
     def delete_student(self, student_id):
         """
         Deletes a student from the database.
@@ -144,73 +238,6 @@ class StudentService:
         try:
             rows_affected = self.db_manager.delete_one('Students', student_id)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error deleting student (ID: {student_id}): {e}")
+        except Exception:
+            logger.exception("Error deleting student (ID: %s)", student_id)
             return False
-
-# Example Usage (for testing purposes)
-if __name__ == '__main__':
-    student_service = StudentService()
-
-    # Ensure some grades exist for testing
-    from database.db_manager import DBManager
-    db_manager = DBManager()
-    grade1_id = db_manager.insert_one('Grades', {'name': 'Grade 1', 'description': 'First year'})
-    grade8_id = db_manager.insert_one('Grades', {'name': 'Grade 8', 'description': 'Final year'})
-
-    print("\n--- Testing StudentService ---")
-
-    # Add students
-    print("Adding John Doe...")
-    john = student_service.add_student("John Doe", "S001", "john@example.com", grade1_id)
-    if john:
-        print(f"Added: {john}")
-    else:
-        print("Failed to add John Doe.")
-
-    print("Adding Jane Smith...")
-    jane = student_service.add_student("Jane Smith", "S002", "jane@example.com", grade8_id)
-    if jane:
-        print(f"Added: {jane}")
-    else:
-        print("Failed to add Jane Smith.")
-
-    # Get all students
-    print("\nAll Students:")
-    all_students = student_service.get_all_students()
-    for s in all_students:
-        print(s)
-
-    # Update a student
-    if john:
-        print(f"\nUpdating John Doe (ID: {john.id})...")
-        updated = student_service.update_student(john.id, contact_info="john.new@example.com", current_grade_id=grade8_id)
-        if updated:
-            updated_john = student_service.get_student_by_id(john.id)
-            print(f"Updated: {updated_john}")
-        else:
-            print("Failed to update John Doe.")
-
-    # Get student by unique ID
-    print("\nGetting student by unique ID 'S002':")
-    found_jane = student_service.get_student_by_unique_id("S002")
-    if found_jane:
-        print(f"Found: {found_jane}")
-    else:
-        print("Student S002 not found.")
-
-    # Delete a student
-    if john:
-        print(f"\nDeleting John Doe (ID: {john.id})...")
-        deleted = student_service.delete_student(john.id)
-        if deleted:
-            print("John Doe deleted successfully.")
-        else:
-            print("Failed to delete John Doe.")
-
-    print("\nAll Students after deletion:")
-    all_students_after_delete = student_service.get_all_students()
-    for s in all_students_after_delete:
-        print(s)
-
-    db_manager.close_connection() # Close connection after testing
@@ -1,16 +1,30 @@
-from database.db_manager import DBManager
+import logging
+from database.db_manager import get_default_db_manager
+from services._refcache import ModelCache
 from models.subject import Subject
 
+logger = logging.getLogger(__name__)
+
+# Columns in Subject.from_row order
+_ALL_SUBJECTS_QUERY = "SELECT id, name, description FROM Subjects ORDER BY name"
+
 class SubjectService:
     """
     Manages business logic related to Subject operations.
     Interacts with the DBManager to perform CRUD operations on Subject data.
     """
-    def __init__(self):
+    # Subjects rarely change, so lookups are served from memory (shared by all instances)
+    _cache = ModelCache('Subjects', _ALL_SUBJECTS_QUERY, Subject)
+
+    def __init__(self, db_manager=None):
         """
         Initializes the SubjectService with a DBManager instance.
+
+        Args:
+            db_manager (DBManager, optional): The DBManager to use.
+                                              Defaults to the shared instance.
         """
-        self.db_manager = DBManager()
+        self.db_manager = db_manager or get_default_db_manager()
 
     def add_subject(self, name, description=None):
         """
@@ -29,8 +43,8 @@ class SubjectService:
             if new_id:
                 return Subject(id=new_id, **subject_data)
             return None
-        except Exception as e:
-            print(f"Error adding subject: {e}")
+        except Exception:
+            logger.exception("Error adding subject")
             return None
 
     def get_subject_by_id(self, subject_id):
@@ -43,8 +57,7 @@ class SubjectService:
         Returns:
             Subject or None: The Subject object if found, None otherwise.
         """
-        data = self.db_manager.get_by_id('Subjects', subject_id)
-        return Subject.from_dict(data) if data else None
+        return self._cache.get_by_id(self.db_manager, subject_id)
 
     def get_subject_by_name(self, name):
         """
@@ -56,9 +69,7 @@ class SubjectService:
         Returns:
             Subject or None: The Subject object if found, None otherwise.
         """
-        query = "SELECT * FROM Subjects WHERE name = ?"
-        data = self.db_manager.fetch_one(query, (name,))
-        return Subject.from_dict(data) if data else None
+        return self._cache.get_by_name(self.db_manager, name)
 
     def get_all_subjects(self):
         """
@@ -67,8 +78,14 @@ class SubjectService:
         Returns:
             list[Subject]: A list of Subject objects.
         """
-        subjects_data = self.db_manager.get_all('Subjects', order_by='name')
-        return [Subject.from_dict(data) for data in subjects_data]
+        return self._cache.get_all(self.db_manager)
+
+    def clear_cache(self):
+        """
+        Forces the next lookup to reload the subjects, e.g. after the database
+        was changed outside this application.
+        """
+        self._cache.clear()
 
     def update_subject(self, subject_id, name=None, description=None):
         """
@@ -89,14 +106,22 @@ class SubjectService:
             update_data['description'] = description
 
         if not update_data:
-            print("No data provided for update.")
+            logger.warning("No data provided for update.")
+            return False
+
+        # Skip the write when the subject already has these values (e.g. "Save" without edits)
+        current = self.get_subject_by_id(subject_id)
+        if current is None:
             return False
+        update_data = {k: v for k, v in update_data.items() if getattr(current, k) != v}
+        if not update_data:
+            return True
 
         try:
             rows_affected = self.db_manager.update_one('Subjects', subject_id, update_data)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error updating subject (ID: {subject_id}): {e}")
+        except Exception:
+            logger.exception("Error updating subject (ID: %s)", subject_id)
             return False
 
     def delete_subject(self, subject_id):
@@ -114,58 +139,6 @@ class SubjectService:
         try:
             rows_affected = self.db_manager.delete_one('Subjects', subject_id)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error deleting subject (ID: {subject_id}): {e}")
+        except Exception:
+            logger.exception("Error deleting subject (ID: %s)", subject_id)
             return False
-
-# Example Usage (for testing purposes)
-if __name__ == '__main__':
-    subject_service = SubjectService()
-
-    print("\n--- Testing SubjectService ---")
-
-    # Add subjects (these should already be in schema.py initial setup)
-    print("Adding extra subject 'Computer Science'...")
-    cs_subject = subject_service.add_subject("Computer Science", "Study of computation and algorithms")
-    if cs_subject:
-        print(f"Added: {cs_subject}")
-    else:
-        print("Failed to add Computer Science (might already exist).")
-
-    # Get all subjects
-    print("\nAll Subjects:")
-    all_subjects = subject_service.get_all_subjects()
-    for s in all_subjects:
-        print(s)
-
-    # Update a subject
-    if cs_subject:
-        print(f"\nUpdating Computer Science (ID: {cs_subject.id})...")
-        updated = subject_service.update_subject(cs_subject.id, description="Updated description for CS")
-        if updated:
-            updated_cs = subject_service.get_subject_by_id(cs_subject.id)
-            print(f"Updated: {updated_cs}")
-        else:
-            print("Failed to update Computer Science.")
-
-    # Get subject by name
-    print("\nGetting subject by name 'Mathematics':")
-    found_math = subject_service.get_subject_by_name("Mathematics")
-    if found_math:
-        print(f"Found: {found_math}")
-    else:
-        print("Mathematics not found.")
-
-    # Delete a subject (use with caution during testing if results are linked)
-    # if cs_subject:
-    #     print(f"\nDeleting Computer Science (ID: {cs_subject.id})...")
-    #     deleted = subject_service.delete_subject(cs_subject.id)
-    #     if deleted:
-    #         print("Computer Science deleted successfully.")
-    #     else:
-    #         print("Failed to delete Computer Science.")
-
-    print("\nAll Subjects after operations:")
-    all_subjects_after = subject_service.get_all_subjects()
-    for s in all_subjects_after:
-        print(s)
@@ -1,9 +1,88 @@
-from database.db_manager import DBManager
+import functools
+import logging
+from database.db_manager import get_default_db_manager
+from services._query_cache import QueryCache
 from models.yearly_result import YearlyResult
 from models.student import Student
 from models.academic_year import AcademicYear
 from services.semester_result_service import SemesterResultService  # To get semester results
 
+logger = logging.getLogger(__name__)
+
+# Columns of the UNIQUE constraint identifying a yearly result
+_YEARLY_RESULT_KEY = ('student_id', 'academic_year_id')
+
+# Columns in YearlyResult.from_row order; a single seek on the UNIQUE index
+_YEARLY_RESULT_BY_COMPOSITE_KEYS_QUERY = """
+    SELECT id, student_id, academic_year_id, total_marks, average_score, grade_rank
+    FROM YearlyResults
+    WHERE student_id = ? AND academic_year_id = ?
+    LIMIT 1
+"""
+
+_YEARLY_RESULT_SELECT = """
+    SELECT
+        yr.id,
+        yr.student_id,
+        st.name AS student_name,
+        st.student_id AS student_unique_id,
+        yr.academic_year_id,
+        ay.year_name AS academic_year_name,
+        yr.total_marks,
+        yr.average_score,
+        yr.grade_rank
+    FROM YearlyResults yr
+    JOIN Students st ON yr.student_id = st.id
+    JOIN AcademicYears ay ON yr.academic_year_id = ay.id
+"""
+
+_BY_YEAR_ORDER = "ay.year_name DESC, st.name"
+
+@functools.lru_cache(maxsize=None)
+def _yearly_results_query(conditions, order_by):
+    """
+    Builds a yearly result listing from _YEARLY_RESULT_SELECT and the given
+    WHERE conditions. Each distinct listing is built once and the same string
+    returned afterwards, so it also reuses one compiled statement.
+
+    Args:
+        conditions (tuple[str]): Conditions joined with AND; may be empty.
+        order_by (str): The ORDER BY expression list.
+    """
+    query = _YEARLY_RESULT_SELECT
+    if conditions:
+        query += "    WHERE " + "\n    AND ".join(conditions) + "\n"
+    query += f"    ORDER BY {order_by}\n"
+    return query
+
+
+# Yearly totals per student: the sum of the semester totals and the mean of the
+# semester averages, ranked by that mean within the student's current grade.
+# Tied averages share a rank, and the next rank skips accordingly (1, 1, 3).
+_YEARLY_TOTALS_QUERY = """
+    SELECT
+        sr.student_id,
+        sr.academic_year_id,
+        SUM(sr.total_marks) AS total_marks,
+        AVG(sr.average_score) AS average_score,
+        RANK() OVER (PARTITION BY s.current_grade_id ORDER BY AVG(sr.average_score) DESC) AS grade_rank
+    FROM SemesterResults sr
+    JOIN Students s ON sr.student_id = s.id
+    WHERE sr.academic_year_id = ?
+    GROUP BY sr.student_id, s.current_grade_id
+"""
+
+# Computes the yearly results and stores them in the same statement, so the rows
+# never travel through Python. Existing results are overwritten in place.
+_STORE_YEARLY_RESULTS_QUERY = """
+    INSERT INTO YearlyResults (student_id, academic_year_id, total_marks, average_score, grade_rank)
+""" + _YEARLY_TOTALS_QUERY + """
+    ON CONFLICT(student_id, academic_year_id) DO UPDATE SET
+        total_marks = excluded.total_marks,
+        average_score = excluded.average_score,
+        grade_rank = excluded.grade_rank
+"""
+
 
 class YearlyResultService:
     """
@@ -11,12 +90,19 @@ class YearlyResultService:
     including computation of yearly results and ranking.
     """
 
-    def __init__(self):
+    def __init__(self, db_manager=None):
         """
         Initializes the YearlyResultService with a DBManager instance.
+
+        Args:
+            db_manager (DBManager, optional): The DBManager to use.
+                                              Defaults to the shared instance.
         """
-        self.db_manager = DBManager()
-        self.semester_result_service = SemesterResultService()  # Dependency
+        self.db_manager = db_manager or get_default_db_manager()
+        self.semester_result_service = SemesterResultService(self.db_manager)  # Dependency, on the same DBManager
+        # Results looked up by student and year are re-read on every UI refresh; they
+        # are kept until the YearlyResults table is written
+        self._lookup_cache = QueryCache(self.db_manager, maxsize=4096)
 
     def add_yearly_result(self, student_id, academic_year_id,
                           total_marks=None, average_score=None, grade_rank=None):
@@ -35,9 +121,6 @@ class YearlyResultService:
             YearlyResult or None: The created/updated YearlyResult object if successful, None otherwise.
         """
         try:
-            existing_result = self.get_yearly_result_by_composite_keys(
-                student_id, academic_year_id)
-
             yearly_result_data = {
                 'student_id': student_id,
                 'academic_year_id': academic_year_id,
@@ -45,19 +128,11 @@ class YearlyResultService:
                 'average_score': average_score,
                 'grade_rank': grade_rank
             }
-
-            if existing_result:
-                # Update existing result
-                self.db_manager.update_one('YearlyResults', existing_result.id, yearly_result_data)
-                return YearlyResult(id=existing_result.id, **yearly_result_data)
-            else:
-                # Insert new result
-                new_id = self.db_manager.insert_one('YearlyResults', yearly_result_data)
-                if new_id:
-                    return YearlyResult(id=new_id, **yearly_result_data)
-            return None
-        except Exception as e:
-            print(f"Error adding/updating yearly result: {e}")
+            # Inserts the result, or updates the existing one, in a single statement
+            result_id = self.db_manager.upsert_one('YearlyResults', yearly_result_data, _YEARLY_RESULT_KEY)
+            return YearlyResult(id=result_id, **yearly_result_data)
+        except Exception:
+            logger.exception("Error adding/updating yearly result")
             return None
 
     def get_yearly_result_by_id(self, result_id):
@@ -84,9 +159,11 @@ class YearlyResultService:
         Returns:
             YearlyResult or None: The YearlyResult object if found, None otherwise.
         """
-        query = "SELECT * FROM YearlyResults WHERE student_id = ? AND academic_year_id = ?"
-        data = self.db_manager.fetch_one(query, (student_id, academic_year_id))
-        return YearlyResult.from_dict(data) if data else None
+        def load():
+            row = self.db_manager.execute_query(_YEARLY_RESULT_BY_COMPOSITE_KEYS_QUERY,
+                                                (student_id, academic_year_id)).fetchone()
+            return YearlyResult.from_row(row) if row else None
+        return self._lookup_cache.get((student_id, academic_year_id), ('YearlyResults',), load)
 
     def get_yearly_results_for_student(self, student_id):
         """
@@ -99,22 +176,7 @@ class YearlyResultService:
             list[dict]: A list of dictionaries, each representing a yearly result
                         with academic year name.
         """
-        query = """
-            SELECT
-                yr.id,
-                yr.student_id,
-                st.name AS student_name,
-                yr.academic_year_id,
-                ay.year_name AS academic_year_name,
-                yr.total_marks,
-                yr.average_score,
-                yr.grade_rank
-            FROM YearlyResults yr
-            JOIN Students st ON yr.student_id = st.id
-            JOIN AcademicYears ay ON yr.academic_year_id = ay.id
-            WHERE yr.student_id = ?
-            ORDER BY ay.year_name DESC
-        """
+        query = _yearly_results_query(('yr.student_id = ?',), _BY_YEAR_ORDER)
         results_data = self.db_manager.fetch_all(query, (student_id,))
         return results_data
 
@@ -131,24 +193,9 @@ class YearlyResultService:
             list[dict]: A list of dictionaries, each representing a yearly result
                         with student, academic year, and grade names.
         """
-        query = """
-            SELECT
-                yr.id,
-                yr.student_id,
-                s.name AS student_name,
-                s.student_id AS student_unique_id,
-                yr.academic_year_id,
-                ay.year_name AS academic_year_name,
-                yr.total_marks,
-                yr.average_score,
-                yr.grade_rank
-            FROM YearlyResults yr
-            JOIN Students s ON yr.student_id = s.id
-            JOIN AcademicYears ay ON yr.academic_year_id = ay.id
-            WHERE yr.academic_year_id = ?
-            AND s.current_grade_id = ? -- Assuming current_grade_id reflects their grade for the year
-            ORDER BY yr.average_score DESC, s.name
-        """
+        # Assumes current_grade_id reflects the students' grade for the year
+        query = _yearly_results_query(('yr.academic_year_id = ?', 'st.current_grade_id = ?'),
+                                      "yr.average_score DESC, st.name")
         results_data = self.db_manager.fetch_all(query, (academic_year_id, grade_id))
         return results_data
 
@@ -159,24 +206,21 @@ class YearlyResultService:
         Returns:
             list[dict]: A list of dictionaries, each representing a yearly result.
         """
-        query = """
-            SELECT
-                yr.id,
-                yr.student_id,
-                st.name AS student_name,
-                st.student_id AS student_unique_id,
-                yr.academic_year_id,
-                ay.year_name AS academic_year_name,
-                yr.total_marks,
-                yr.average_score,
-                yr.grade_rank
-            FROM YearlyResults yr
-            JOIN Students st ON yr.student_id = st.id
-            JOIN AcademicYears ay ON yr.academic_year_id = ay.id
-            ORDER BY ay.year_name DESC, st.name
+        return list(self.iter_all_yearly_results())
+
+    def iter_all_yearly_results(self, chunk_size=1000):
         """
-        results_data = self.db_manager.fetch_all(query)
-        return results_data
+        Streams all yearly results with related details, reading chunk_size rows
+        from the database at a time. Suited to large reports and exports that
+        process results one by one.
+
+        Args:
+            chunk_size (int, optional): Number of rows fetched per round. Defaults to 1000.
+
+        Yields:
+            dict: A dictionary representing a yearly result, as in get_all_yearly_results().
+        """
+        yield from self.db_manager.iter_all(_yearly_results_query((), _BY_YEAR_ORDER), chunk_size=chunk_size)
 
     def update_yearly_result(self, result_id, total_marks=None, average_score=None, grade_rank=None):
         """
@@ -200,14 +244,14 @@ class YearlyResultService:
             update_data['grade_rank'] = grade_rank
 
         if not update_data:
-            print("No data provided for update.")
+            logger.warning("No data provided for update.")
             return False
 
         try:
             rows_affected = self.db_manager.update_one('YearlyResults', result_id, update_data)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error updating yearly result (ID: {result_id}): {e}")
+        except Exception:
+            logger.exception("Error updating yearly result (ID: %s)", result_id)
             return False
 
     def delete_yearly_result(self, result_id):
@@ -223,8 +267,8 @@ class YearlyResultService:
         try:
             rows_affected = self.db_manager.delete_one('YearlyResults', result_id)
             return rows_affected > 0
-        except Exception as e:
-            print(f"Error deleting yearly result (ID: {result_id}): {e}")
+        except Exception:
+            logger.exception("Error deleting yearly result (ID: %s)", result_id)
             return False
 
     def compute_and_store_yearly_results(self, academic_year_id):
@@ -235,251 +279,140 @@ class YearlyResultService:
         Args:
             academic_year_id (int): The ID of the academic year.
         """
-        print(f"\n--- Computing Yearly Results for AY {academic_year_id} ---")
-
-        # 1. Get all semester results for this academic year
-        query_semester_results = """
-            SELECT
-                sr.student_id,
-                sr.total_marks,
-                sr.average_score,
-                s.current_grade_id AS grade_id -- Need student's grade for yearly ranking
-            FROM SemesterResults sr
-            JOIN Students s ON sr.student_id = s.id
-            WHERE sr.academic_year_id = ?
-        """
-        semester_results_data = self.db_manager.fetch_all(query_semester_results, (academic_year_id,))
+        # Sum up each student's semester results, rank the students within their grade
+        # and upsert the results into YearlyResults, all in one statement
+        stored = self.db_manager.execute_query(_STORE_YEARLY_RESULTS_QUERY, (academic_year_id,)).rowcount
 
-        if not semester_results_data:
-            print("No semester results found for this academic year. Cannot compute yearly results.")
+        if not stored:
+            logger.info("No semester results found for AY %s. Cannot compute yearly results.", academic_year_id)
             return
-
-        # Aggregate semester results per student
-        student_yearly_data = {}  # {student_id: {'total_marks': X, 'count_semesters': Y, 'grade_id': Z}}
-
-        for res in semester_results_data:
-            student_id = res['student_id']
-            total_marks = res['total_marks']
-            average_score = res['average_score']  # This is semester average, not yearly avg
-
-            if student_id not in student_yearly_data:
-                student_yearly_data[student_id] = {
-                    'total_marks_sum': 0.0,
-                    'average_score_sum': 0.0,  # Sum of semester averages
-                    'num_semesters': 0,
-                    'grade_id': res['grade_id']
-                }
-            student_yearly_data[student_id]['total_marks_sum'] += total_marks
-            student_yearly_data[student_id]['average_score_sum'] += average_score
-            student_yearly_data[student_id]['num_semesters'] += 1
-
-        # Calculate final yearly total and average for each student
-        for student_id, data in student_yearly_data.items():
-            final_total_marks = data['total_marks_sum']
-            final_average_score = data['average_score_sum'] / data['num_semesters'] if data[
-                                                                                           'num_semesters'] > 0 else 0.0
-
-            student_yearly_data[student_id]['total_marks'] = final_total_marks
-            student_yearly_data[student_id]['average_score'] = final_average_score
-
-        # 2. Compute ranks per grade for the academic year
-        # Get all unique grades involved in this academic year's results
-        grades_in_year = sorted(list(set([s['grade_id'] for s in student_yearly_data.values()])))
-
-        for grade_id in grades_in_year:
-            # Filter students belonging to this grade and who have computed yearly results
-            students_in_grade = [
-                (s_id, data['average_score'])
-                for s_id, data in student_yearly_data.items()
-                if data['grade_id'] == grade_id
-            ]
-            # Sort by average score in descending order
-            students_in_grade.sort(key=lambda x: x[1], reverse=True)
-
-            current_rank = 1
-            prev_score = -1  # Sentinel value
-            for i, (s_id, avg_score) in enumerate(students_in_grade):
-                if avg_score != prev_score:
-                    current_rank = i + 1
-                student_yearly_data[s_id]['grade_rank'] = current_rank
-                prev_score = avg_score
-
-        # 3. Store/Update results in YearlyResults table
-        for student_id, data in student_yearly_data.items():
-            self.add_yearly_result(
-                student_id=student_id,
-                academic_year_id=academic_year_id,
-                total_marks=data['total_marks'],
-                average_score=data['average_score'],
-                grade_rank=data['grade_rank']
-            )
-            print(
-                f"Computed/Stored Yearly Result for Student {student_id}: Total={data['total_marks']:.2f}, Avg={data['average_score']:.2f}%, Rank={data['grade_rank']}")
-
-        print("Yearly result computation complete.")
+        logger.info("Computed %d yearly results for AY %s.", stored, academic_year_id)
 
 
 # Example Usage (for testing purposes)
 if __name__ == '__main__':
     yearly_result_service = YearlyResultService()
-    db_manager = DBManager()  # For fetching IDs for testing
+    db_manager = yearly_result_service.db_manager # Same shared instance, for fetching IDs for testing
 
     # --- Ensure Semester Results exist for computation ---
     # Run the SemesterResultService test block or ensure data is present
     from services.semester_result_service import SemesterResultService
 
-    sem_res_service = SemesterResultService()
+    sem_res_service = SemesterResultService(db_manager)
 
     # Setup necessary data (copy-pasted from semester_result_service test for completeness)
-    grade1_id = db_manager.get_grade_by_name('Grade 1')['id'] if db_manager.get_grade_by_name(
-        'Grade 1') else db_manager.insert_one('Grades', {'name': 'Grade 1'})
-    grade2_id = db_manager.get_grade_by_name('Grade 2')['id'] if db_manager.get_grade_by_name(
-        'Grade 2') else db_manager.insert_one('Grades', {'name': 'Grade 2'})
-    ay_2023_2024_id = db_manager.get_academic_year_by_name('2023/2024')['id'] if db_manager.get_academic_year_by_name(
-        '2023/2024') else db_manager.insert_one('AcademicYears', {'year_name': '2023/2024', 'start_date': '2023-09-01',
-                                                                  'end_date': '2024-07-31'})
-    sem1_id = db_manager.get_semester_by_name('Semester 1')['id'] if db_manager.get_semester_by_name(
-        'Semester 1') else db_manager.insert_one('Semesters', {'name': 'Semester 1', 'start_date': '2023-09-01',
-                                                               'end_date': '2024-01-31'})
-    sem2_id = db_manager.get_semester_by_name('Semester 2')['id'] if db_manager.get_semester_by_name(
-        'Semester 2') else db_manager.insert_one('Semesters', {'name': 'Semester 2', 'start_date': '2024-02-01',
-                                                               'end_date': '2024-07-31'})
-    student_john_id = db_manager.get_student_by_unique_id('S001')['id'] if db_manager.get_student_by_unique_id(
-        'S001') else db_manager.insert_one('Students', {'name': 'John Doe', 'student_id': 'S001',
-                                                        'contact_info': 'john@example.com',
-                                                        'current_grade_id': grade1_id})
-    student_jane_id = db_manager.get_student_by_unique_id('S002')['id'] if db_manager.get_student_by_unique_id(
-        'S002') else db_manager.insert_one('Students', {'name': 'Jane Smith', 'student_id': 'S002',
-                                                        'contact_info': 'jane@example.com',
-                                                        'current_grade_id': grade1_id})
-    student_mike_id = db_manager.get_student_by_unique_id('S003')['id'] if db_manager.get_student_by_unique_id(
-        'S003') else db_manager.insert_one('Students', {'name': 'Mike Brown', 'student_id': 'S003',
-                                                        'contact_info': 'mike@example.com',
-                                                        'current_grade_id': grade2_id})
-    math_id = db_manager.get_subject_by_name('Mathematics')['id'] if db_manager.get_subject_by_name(
-        'Mathematics') else db_manager.insert_one('Subjects', {'name': 'Mathematics'})
-    science_id = db_manager.get_subject_by_name('Science')['id'] if db_manager.get_subject_by_name(
-        'Science') else db_manager.insert_one('Subjects', {'name': 'Science'})
-    english_id = db_manager.get_subject_by_name('English')['id'] if db_manager.get_subject_by_name(
-        'English') else db_manager.insert_one('Subjects', {'name': 'English'})
+    from services.grade_service import GradeService
+    from services.student_service import StudentService
+    from services.subject_service import SubjectService
+    from services.academic_year_service import AcademicYearService
+    from services.semester_service import SemesterService
+    from services.exam_service import ExamService
+
+    # Reference data. Rows that already exist (by their UNIQUE name or ID) are skipped,
+    # so re-running the script adds nothing; the IDs are then looked up by name.
+    grade_service = GradeService(db_manager)
+    student_service = StudentService(db_manager)
+    subject_service = SubjectService(db_manager)
+    academic_year_service = AcademicYearService(db_manager)
+    semester_service = SemesterService(db_manager)
+    exam_service = ExamService(db_manager)
+
+    # Grades
+    grade_service.add_grades([{'name': 'Grade 1'}, {'name': 'Grade 2'}])
+    grade1_id = grade_service.get_grade_by_name('Grade 1').id
+    grade2_id = grade_service.get_grade_by_name('Grade 2').id
+
+    # Academic Year and Semesters
+    db_manager.insert_one('AcademicYears', {'year_name': '2023/2024', 'start_date': '2023-09-01',
+                                            'end_date': '2024-07-31'}, ignore_duplicates=True)
+    db_manager.insert_many('Semesters', [
+        {'name': 'Semester 1', 'start_date': '2023-09-01', 'end_date': '2024-01-31'},
+        {'name': 'Semester 2', 'start_date': '2024-02-01', 'end_date': '2024-07-31'},
+    ], ignore_duplicates=True)
+    ay_2023_2024_id = academic_year_service.get_academic_year_by_name('2023/2024').id
+    sem1_id = semester_service.get_semester_by_name('Semester 1').id
+    sem2_id = semester_service.get_semester_by_name('Semester 2').id
+
+    # Students (ensure their current_grade_id is set correctly for ranking)
+    student_service.add_students([
+        {'name': 'John Doe', 'student_id': 'S001', 'contact_info': 'john@example.com', 'current_grade_id': grade1_id},
+        # Jane also in Grade 1 for ranking test
+        {'name': 'Jane Smith', 'student_id': 'S002', 'contact_info': 'jane@example.com', 'current_grade_id': grade1_id},
+        {'name': 'Mike Brown', 'student_id': 'S003', 'contact_info': 'mike@example.com', 'current_grade_id': grade2_id},
+    ])
+    student_john_id = student_service.get_student_by_unique_id('S001').id
+    student_jane_id = student_service.get_student_by_unique_id('S002').id
+    student_mike_id = student_service.get_student_by_unique_id('S003').id
+
+    # Subjects
+    db_manager.insert_many('Subjects', [{'name': 'Mathematics'}, {'name': 'Science'}, {'name': 'English'}],
+                           ignore_duplicates=True)
+    math_id = subject_service.get_subject_by_name('Mathematics').id
+    science_id = subject_service.get_subject_by_name('Science').id
+    english_id = subject_service.get_subject_by_name('English').id
 
     # Enrollments
-    db_manager.insert_one('Enrollments',
-                          {'student_id': student_john_id, 'academic_year_id': ay_2023_2024_id, 'grade_id': grade1_id})
-    db_manager.insert_one('Enrollments',
-                          {'student_id': student_jane_id, 'academic_year_id': ay_2023_2024_id, 'grade_id': grade1_id})
-    db_manager.insert_one('Enrollments',
-                          {'student_id': student_mike_id, 'academic_year_id': ay_2023_2024_id, 'grade_id': grade2_id})
+    db_manager.insert_many('Enrollments', [
+        {'student_id': student_john_id, 'academic_year_id': ay_2023_2024_id, 'grade_id': grade1_id},
+        {'student_id': student_jane_id, 'academic_year_id': ay_2023_2024_id, 'grade_id': grade1_id},
+        {'student_id': student_mike_id, 'academic_year_id': ay_2023_2024_id, 'grade_id': grade2_id},
+    ], ignore_duplicates=True)
 
     # Exams
-    exam_s1_23_id = db_manager.get_exam_by_name_and_period("Semester 1 Exam", ay_2023_2024_id, sem1_id)[
-        'id'] if db_manager.get_exam_by_name_and_period("Semester 1 Exam", ay_2023_2024_id,
-                                                        sem1_id) else db_manager.insert_one('Exams',
-                                                                                            {'name': 'Semester 1 Exam',
-                                                                                             'academic_year_id': ay_2023_2024_id,
-                                                                                             'semester_id': sem1_id,
-                                                                                             'max_marks': 100})
-    cat1_s1_23_id = db_manager.get_exam_by_name_and_period("CAT 1", ay_2023_2024_id, sem1_id)[
-        'id'] if db_manager.get_exam_by_name_and_period("CAT 1", ay_2023_2024_id, sem1_id) else db_manager.insert_one(
-        'Exams', {'name': 'CAT 1', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem1_id, 'max_marks': 30})
-    cat2_s1_23_id = db_manager.get_exam_by_name_and_period("CAT 2", ay_2023_2024_id, sem1_id)[
-        'id'] if db_manager.get_exam_by_name_and_period("CAT 2", ay_2023_2024_id, sem1_id) else db_manager.insert_one(
-        'Exams', {'name': 'CAT 2', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem1_id, 'max_marks': 30})
-    exam_s2_23_id = db_manager.get_exam_by_name_and_period("Semester 2 Exam", ay_2023_2024_id, sem2_id)[
-        'id'] if db_manager.get_exam_by_name_and_period("Semester 2 Exam", ay_2023_2024_id,
-                                                        sem2_id) else db_manager.insert_one('Exams',
-                                                                                            {'name': 'Semester 2 Exam',
-                                                                                             'academic_year_id': ay_2023_2024_id,
-                                                                                             'semester_id': sem2_id,
-                                                                                             'max_marks': 100})
-    cat1_s2_23_id = db_manager.get_exam_by_name_and_period("CAT 1", ay_2023_2024_id, sem2_id)[
-        'id'] if db_manager.get_exam_by_name_and_period("CAT 1", ay_2023_2024_id, sem2_id) else db_manager.insert_one(
-        'Exams', {'name': 'CAT 1', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem2_id, 'max_marks': 30})
-    cat2_s2_23_id = db_manager.get_exam_by_name_and_period("CAT 2", ay_2023_2024_id, sem2_id)[
-        'id'] if db_manager.get_exam_by_name_and_period("CAT 2", ay_2023_2024_id, sem2_id) else db_manager.insert_one(
-        'Exams', {'name': 'CAT 2', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem2_id, 'max_marks': 30})
+    exam_service.add_exams([
+        {'name': 'Semester 1 Exam', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem1_id, 'max_marks': 100},
+        {'name': 'CAT 1', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem1_id, 'max_marks': 30},
+        {'name': 'CAT 2', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem1_id, 'max_marks': 30},
+        {'name': 'Semester 2 Exam', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem2_id, 'max_marks': 100},
+        {'name': 'CAT 1', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem2_id, 'max_marks': 30},
+        {'name': 'CAT 2', 'academic_year_id': ay_2023_2024_id, 'semester_id': sem2_id, 'max_marks': 30},
+    ])
+    exam_s1_23_id = exam_service.get_exam_by_name_and_period('Semester 1 Exam', ay_2023_2024_id, sem1_id).id
+    cat1_s1_23_id = exam_service.get_exam_by_name_and_period('CAT 1', ay_2023_2024_id, sem1_id).id
+    cat2_s1_23_id = exam_service.get_exam_by_name_and_period('CAT 2', ay_2023_2024_id, sem1_id).id
+    exam_s2_23_id = exam_service.get_exam_by_name_and_period('Semester 2 Exam', ay_2023_2024_id, sem2_id).id
+    cat1_s2_23_id = exam_service.get_exam_by_name_and_period('CAT 1', ay_2023_2024_id, sem2_id).id
+    cat2_s2_23_id = exam_service.get_exam_by_name_and_period('CAT 2', ay_2023_2024_id, sem2_id).id
 
     # Exam Results (ensure these are added for both semesters)
-    # John Doe S1
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': exam_s1_23_id, 'subject_id': math_id, 'marks': 70})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': cat1_s1_23_id, 'subject_id': math_id, 'marks': 25})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': cat2_s1_23_id, 'subject_id': math_id, 'marks': 28})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': exam_s1_23_id, 'subject_id': science_id,
-                           'marks': 65})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': cat1_s1_23_id, 'subject_id': science_id,
-                           'marks': 20})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': cat2_s1_23_id, 'subject_id': science_id,
-                           'marks': 22})
-    # John Doe S2
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': exam_s2_23_id, 'subject_id': math_id, 'marks': 75})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': cat1_s2_23_id, 'subject_id': math_id, 'marks': 26})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': cat2_s2_23_id, 'subject_id': math_id, 'marks': 29})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': exam_s2_23_id, 'subject_id': science_id,
-                           'marks': 70})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': cat1_s2_23_id, 'subject_id': science_id,
-                           'marks': 23})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_john_id, 'exam_id': cat2_s2_23_id, 'subject_id': science_id,
-                           'marks': 25})
-
-    # Jane Smith S1
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': exam_s1_23_id, 'subject_id': math_id, 'marks': 80})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': cat1_s1_23_id, 'subject_id': math_id, 'marks': 28})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': cat2_s1_23_id, 'subject_id': math_id, 'marks': 29})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': exam_s1_23_id, 'subject_id': english_id,
-                           'marks': 75})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': cat1_s1_23_id, 'subject_id': english_id,
-                           'marks': 26})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': cat2_s1_23_id, 'subject_id': english_id,
-                           'marks': 27})
-    # Jane Smith S2
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': exam_s2_23_id, 'subject_id': math_id, 'marks': 85})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': cat1_s2_23_id, 'subject_id': math_id, 'marks': 29})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': cat2_s2_23_id, 'subject_id': math_id, 'marks': 30})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': exam_s2_23_id, 'subject_id': english_id,
-                           'marks': 80})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': cat1_s2_23_id, 'subject_id': english_id,
-                           'marks': 28})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_jane_id, 'exam_id': cat2_s2_23_id, 'subject_id': english_id,
-                           'marks': 29})
-
-    # Mike Brown S1
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_mike_id, 'exam_id': exam_s1_23_id, 'subject_id': math_id, 'marks': 90})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_mike_id, 'exam_id': cat1_s1_23_id, 'subject_id': math_id, 'marks': 29})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_mike_id, 'exam_id': cat2_s1_23_id, 'subject_id': math_id, 'marks': 30})
-    # Mike Brown S2
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_mike_id, 'exam_id': exam_s2_23_id, 'subject_id': math_id, 'marks': 95})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_mike_id, 'exam_id': cat1_s2_23_id, 'subject_id': math_id, 'marks': 30})
-    db_manager.insert_one('ExamResults',
-                          {'student_id': student_mike_id, 'exam_id': cat2_s2_23_id, 'subject_id': math_id, 'marks': 30})
+    db_manager.insert_many('ExamResults', [
+        # John Doe S1
+        {'student_id': student_john_id, 'exam_id': exam_s1_23_id, 'subject_id': math_id, 'marks': 70},
+        {'student_id': student_john_id, 'exam_id': cat1_s1_23_id, 'subject_id': math_id, 'marks': 25},
+        {'student_id': student_john_id, 'exam_id': cat2_s1_23_id, 'subject_id': math_id, 'marks': 28},
+        {'student_id': student_john_id, 'exam_id': exam_s1_23_id, 'subject_id': science_id, 'marks': 65},
+        {'student_id': student_john_id, 'exam_id': cat1_s1_23_id, 'subject_id': science_id, 'marks': 20},
+        {'student_id': student_john_id, 'exam_id': cat2_s1_23_id, 'subject_id': science_id, 'marks': 22},
+        # John Doe S2
+        {'student_id': student_john_id, 'exam_id': exam_s2_23_id, 'subject_id': math_id, 'marks': 75},
+        {'student_id': student_john_id, 'exam_id': cat1_s2_23_id, 'subject_id': math_id, 'marks': 26},
+        {'student_id': student_john_id, 'exam_id': cat2_s2_23_id, 'subject_id': math_id, 'marks': 29},
+        {'student_id': student_john_id, 'exam_id': exam_s2_23_id, 'subject_id': science_id, 'marks': 70},
+        {'student_id': student_john_id, 'exam_id': cat1_s2_23_id, 'subject_id': science_id, 'marks': 23},
+        {'student_id': student_john_id, 'exam_id': cat2_s2_23_id, 'subject_id': science_id, 'marks': 25},
+        # Jane Smith S1
+        {'student_id': student_jane_id, 'exam_id': exam_s1_23_id, 'subject_id': math_id, 'marks': 80},
+        {'student_id': student_jane_id, 'exam_id': cat1_s1_23_id, 'subject_id': math_id, 'marks': 28},
+        {'student_id': student_jane_id, 'exam_id': cat2_s1_23_id, 'subject_id': math_id, 'marks': 29},
+        {'student_id': student_jane_id, 'exam_id': exam_s1_23_id, 'subject_id': english_id, 'marks': 75},
+        {'student_id': student_jane_id, 'exam_id': cat1_s1_23_id, 'subject_id': english_id, 'marks': 26},
+        {'student_id': student_jane_id, 'exam_id': cat2_s1_23_id, 'subject_id': english_id, 'marks': 27},
+        # Jane Smith S2
+        {'student_id': student_jane_id, 'exam_id': exam_s2_23_id, 'subject_id': math_id, 'marks': 85},
+        {'student_id': student_jane_id, 'exam_id': cat1_s2_23_id, 'subject_id': math_id, 'marks': 29},
+        {'student_id': student_jane_id, 'exam_id': cat2_s2_23_id, 'subject_id': math_id, 'marks': 30},
+        {'student_id': student_jane_id, 'exam_id': exam_s2_23_id, 'subject_id': english_id, 'marks': 80},
+        {'student_id': student_jane_id, 'exam_id': cat1_s2_23_id, 'subject_id': english_id, 'marks': 28},
+        {'student_id': student_jane_id, 'exam_id': cat2_s2_23_id, 'subject_id': english_id, 'marks': 29},
+        # Mike Brown S1
+        {'student_id': student_mike_id, 'exam_id': exam_s1_23_id, 'subject_id': math_id, 'marks': 90},
+        {'student_id': student_mike_id, 'exam_id': cat1_s1_23_id, 'subject_id': math_id, 'marks': 29},
+        {'student_id': student_mike_id, 'exam_id': cat2_s1_23_id, 'subject_id': math_id, 'marks': 30},
+        # Mike Brown S2
+        {'student_id': student_mike_id, 'exam_id': exam_s2_23_id, 'subject_id': math_id, 'marks': 95},
+        {'student_id': student_mike_id, 'exam_id': cat1_s2_23_id, 'subject_id': math_id, 'marks': 30},
+        {'student_id': student_mike_id, 'exam_id': cat2_s2_23_id, 'subject_id': math_id, 'marks': 30},
+    ], ignore_duplicates=True)
 
     # First, compute Semester 1 results
     sem_res_service.compute_and_store_semester_results(ay_2023_2024_id, sem1_id)
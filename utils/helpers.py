@@ -1,8 +1,18 @@
 import tkinter as tk
 from tkinter import messagebox
+import functools
 import re
+import time
 from datetime import datetime
 
+# Basic regex for email validation, compiled once at import; only its bound
+# fullmatch is kept, so calls skip the attribute lookup
+_email_fullmatch = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}').fullmatch
+
+# An error identical to the last one, raised this soon after it was dismissed, is not shown again
+_ERROR_REPEAT_SECONDS = 0.5
+_last_error = (None, 0.0) # ((title, message), time the dialog was closed)
+
 def show_info_message(title, message):
     """Displays an information message box."""
     messagebox.showinfo(title, message)
@@ -12,8 +22,16 @@ def show_warning_message(title, message):
     messagebox.showwarning(title, message)
 
 def show_error_message(title, message):
-    """Displays an error message box."""
+    """
+    Displays an error message box, unless the same error was dismissed less than
+    half a second ago (e.g. the same failure reported for every row of a batch).
+    """
+    global _last_error
+    error = (title, message)
+    if error == _last_error[0] and time.monotonic() - _last_error[1] < _ERROR_REPEAT_SECONDS:
+        return
     messagebox.showerror(title, message)
+    _last_error = (error, time.monotonic()) # The dialog blocks, so this is when it was closed
 
 def ask_confirmation(title, message):
     """Asks for user confirmation."""
@@ -25,8 +43,24 @@ def is_valid_date(date_string):
     """
     if not isinstance(date_string, str):
         return False
+    return _is_valid_date_str(date_string)
+
+@functools.lru_cache(maxsize=4096)
+def _is_valid_date_str(date_string):
+    """
+    Checks the fixed YYYY-MM-DD layout by position and lets datetime() reject
+    impossible dates, instead of running strptime's generic format parser.
+    Imports and forms validate the same dates over and over, so results are
+    memoized per string.
+    """
+    if len(date_string) != 10 or date_string[4] != '-' or date_string[7] != '-':
+        return False
+    year, month, day = date_string[:4], date_string[5:7], date_string[8:10]
+    # ASCII digits only: int() would also accept signs, spaces, '_' and other scripts' digits
+    if not (date_string.isascii() and year.isdigit() and month.isdigit() and day.isdigit()):
+        return False
     try:
-        datetime.strptime(date_string, '%Y-%m-%d')
+        datetime(int(year), int(month), int(day))
         return True
     except ValueError:
         return False
@@ -37,21 +71,34 @@ def is_valid_email(email):
     """
     if not isinstance(email, str):
         return False
-    # Basic regex for email validation
-    regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(regex, email) is not None
+    # Cheap rejections first: the pattern needs an '@' and ASCII only, and no address
+    # may exceed 254 characters (RFC 5321), which also bounds the regex's backtracking
+    if '@' not in email or len(email) > 254 or not email.isascii():
+        return False
+    return _email_fullmatch(email) is not None
 
 def is_valid_student_id(student_id):
     """
     Checks if a student ID is valid (e.g., alphanumeric, specific format).
     For now, just checks if it's a non-empty string.
     """
-    return isinstance(student_id, str) and len(student_id.strip()) > 0
+    # Same as a non-empty strip(), without building the stripped copy
+    return isinstance(student_id, str) and student_id != '' and not student_id.isspace()
 
 def is_valid_marks(marks):
     """
     Checks if marks are a valid float or int and non-negative.
     """
+    # Numbers need no conversion or exception handling; NaN compares False as before.
+    # Exact type checks leave bools and other numeric types to float() below.
+    if type(marks) is float or type(marks) is int:
+        return marks >= 0
+    if type(marks) is str:
+        # Form input is usually a plain number such as "85" or "85.5", which is
+        # accepted without parsing; anything else falls through to float()
+        digits = marks.strip().replace('.', '', 1)
+        if digits.isascii() and digits.isdigit():
+            return True
     try:
         marks_float = float(marks)
         return marks_float >= 0
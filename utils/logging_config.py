@@ -0,0 +1,59 @@
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops repeats of the same log message beyond a number per time window, so a
+    burst of identical errors (e.g. a malformed import) doesn't flood the log.
+    Messages are grouped by logger and unformatted message text.
+    """
+    def __init__(self, rate=10, per=60.0):
+        """
+        Initializes the RateLimitFilter.
+
+        Args:
+            rate (int, optional): Records let through per message and window. Defaults to 10.
+            per (float, optional): Length of the window in seconds. Defaults to 60.
+        """
+        super().__init__()
+        self.rate = rate
+        self.per = per
+        self._windows = {} # (logger name, message) -> (window start, count)
+
+    def filter(self, record):
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        start, count = self._windows.get(key, (now, 0))
+        if now - start >= self.per:
+            start, count = now, 0
+        self._windows[key] = (start, count + 1)
+        return count < self.rate
+
+def configure_logging(level=logging.WARNING):
+    """
+    Configures the root logger for the application. Records are put on a queue
+    and written to stderr by a background thread, so the GUI never waits on I/O.
+
+    Args:
+        level (int, optional): The minimum level to log. Defaults to logging.WARNING.
+
+    Returns:
+        QueueListener: The started listener; call stop() on exit to flush it.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = QueueListener(log_queue, stream_handler)
+
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+
+    listener.start()
+    return listener